@@ -78,7 +78,7 @@ class CareLogService:
             id=log_id,
             patient_id=patient_id,
             timestamp=current_time,
-            pain_level=str(pain_level),  # Ensure pain_level is a string before encryption
+            pain_level=pain_level,
             mood=mood,
             appetite=appetite,
             notes=notes
@@ -116,12 +116,16 @@ class CareLogService:
         if patient_dict is None:
             return None
         patient = Patient.patient_from_dict(patient_dict)
-        if phone is not None:
+        changed = False
+        # Skip re-encryption and the file rewrite for values that are unchanged
+        if phone is not None and phone != patient.get_decrypted_phone():
             patient.phone = patient.encrypt_field(phone)
-        if email is not None:
+            changed = True
+        if email is not None and email != patient.get_decrypted_email():
             patient.email = patient.encrypt_field(email)
-        patient_dict = patient.to_dict()
-        DataStore.upsert("patients", "id", patient_dict)
+            changed = True
+        if changed:
+            DataStore.upsert("patients", "id", patient.to_dict())
         return patient
 
     @classmethod
@@ -2,8 +2,101 @@ from __future__ import annotations
 
 import json
 import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from functools import partial
+from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib json module is used otherwise
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # optional read-side fallback when orjson is missing
+    ujson = None
+
+try:
+    import msgpack
+except ImportError:  # optional; enables the binary sidecar cache in load_all()
+    msgpack = None
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values the stdlib json module cannot handle natively."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize `data` to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        # orjson encodes datetime natively and only supports a 2-space indent.
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2)
+    # Same layout as orjson so the file does not churn when it is installed.
+    return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def _target_mode(path: Path) -> int:
+    """Return the permission bits a rewrite of `path` should keep."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        # New file: what open() would have created under the current umask.
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _atomic_write(path: Path, payload: bytes, mode: Optional[int] = None) -> None:
+    """Replace `path` with `payload` without ever exposing a partial file.
+
+    The bytes go to a uniquely named temporary file in the same directory
+    with a single write, which is then renamed over `path`. No fsync is
+    issued; os.replace alone guarantees readers see the old or new file.
+    mkstemp creates the file as 0600, so it is given `mode` before the
+    rename; by default, the mode of the file it replaces (or the umask
+    default for a new file).
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.chmod(tmp_name, _target_mode(path) if mode is None else mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _copy(value: Any) -> Any:
+    """Deep-copy a parsed JSON document (dicts and lists; leaves are immutable).
+
+    Used when the cached bytes cannot be re-parsed faster (stdlib json, or an
+    open batch whose snapshot has diverged from the file).
+    """
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse UTF-8 JSON bytes with orjson, else ujson, else the stdlib parser."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    if ujson is not None:
+        return ujson.loads(raw)
+    return json.loads(raw)
 
 
 class DataStore:
@@ -18,6 +111,33 @@ class DataStore:
     DATA_DIR = Path("data")
     DATA_FILE = DATA_DIR / "carelog_data.json"
 
+    # Batch state: while _batch_depth > 0, load_all() serves the in-memory
+    # snapshot and save_all() only marks it dirty; the outermost end_batch()
+    # writes it once.
+    _batch_depth = 0
+    _batch_data: Optional[Dict[str, Any]] = None
+    _batch_dirty = False
+
+    # get_by_id lookup tables keyed by (collection, id_key). They are only
+    # trusted while the data file still has the signature they were built
+    # from, and are dropped whenever save_all() runs.
+    _indexes: Dict[Tuple[str, str], Dict[Any, Dict[str, Any]]] = {}
+    _index_signature: Optional[Tuple[Any, ...]] = None
+
+    # Last parsed document, the file signature it was read from, and (when a
+    # C parser is available) a callable that parses the same bytes again.
+    # load_all() serves it without touching the file while the signature on
+    # disk still matches; re-parsing the cached bytes with orjson or msgpack
+    # is several times faster than a Python deep copy of the document.
+    _cache: Optional[
+        Tuple[Tuple[Any, ...], Dict[str, Any], Optional[Callable[[], Dict[str, Any]]]]
+    ] = None
+
+    # Signature of the last file this process wrote. Re-reading our own save
+    # does not rebuild the MessagePack sidecar: that would add a second write
+    # to every save. The sidecar is rebuilt by the next process that loads it.
+    _written_signature: Optional[Tuple[Any, ...]] = None
+
     @classmethod
     def ensure_data_file(cls) -> None:
         """Create parent directory for DATA_FILE and an initial JSON file if missing.
@@ -36,50 +156,215 @@ class DataStore:
                 "notes": [],
                 "schedules": [],
             }
-            tmp_path = Path(cls.DATA_FILE).with_suffix(".tmp")
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(initial, f, indent=4, ensure_ascii=False)
-            os.replace(tmp_path, cls.DATA_FILE)
+            _atomic_write(Path(cls.DATA_FILE), _dumps(initial))
 
     @classmethod
     def load_all(cls) -> Dict[str, Any]:
         """Load and return the entire JSON data structure.
 
-        Returns an in-memory dict. The caller should not mutate the returned
-        dict if it intends to persist changes; use the provided helpers.
+        Returns a private copy of the document: the caller may mutate it
+        freely, and changes only take effect once passed to save_all(). The
+        parsed document itself is cached until the file's stat signature
+        changes, so repeated calls skip the file read.
+        """
+        data = cls._load()
+        cached = cls._cache
+        # A batch snapshot may already differ from the bytes it was read from.
+        if not cls._batch_depth and cached is not None and cached[1] is data:
+            fresh = cached[2]
+            if fresh is not None:
+                return fresh()
+        return _copy(data)
+
+    @classmethod
+    def _load(cls) -> Dict[str, Any]:
+        """Return the shared cached document (or the open batch snapshot).
+
+        Only for helpers that save straight after mutating it: _write()
+        drops the cache before writing, so a failed save cannot leave
+        unsaved changes behind for later reads.
+        """
+        if cls._batch_depth and cls._batch_data is not None:
+            return cls._batch_data
+        cached = cls._cache
+        if cached is not None and cached[0] == cls._file_signature():
+            data = cached[1]
+        else:
+            cls.ensure_data_file()
+            with open(cls.DATA_FILE, "rb") as f:
+                # fstat the handle we read so the signature matches these bytes
+                signature = cls._stat_signature(os.fstat(f.fileno()))
+                sidecar = cls._read_sidecar(signature)
+                if sidecar is not None:
+                    data, fresh = sidecar
+                else:
+                    raw = f.read()
+                    data = _loads(raw)
+                    fresh = partial(orjson.loads, raw) if orjson is not None else None
+                    if signature != cls._written_signature:
+                        cls._write_sidecar(signature, data)
+            cls._cache = (signature, data, fresh)
+        if cls._batch_depth:
+            cls._batch_data = data
+        return data
+
+    @classmethod
+    def _sidecar_path(cls) -> Path:
+        return Path(cls.DATA_FILE).with_suffix(".msgpack")
+
+    @classmethod
+    def _read_sidecar(
+        cls, signature: Tuple[Any, ...]
+    ) -> Optional[Tuple[Dict[str, Any], Callable[[], Dict[str, Any]]]]:
+        """Return the document from the MessagePack sidecar if it was built
+        from the JSON file with this exact signature, else None.
+
+        Alongside the document comes a callable that unpacks the same bytes
+        again, which load_all() uses to hand out private copies.
+
+        The sidecar is only a cache: it is used when msgpack is installed,
+        and any mismatch or read error falls back to parsing the JSON.
         """
-        cls.ensure_data_file()
-        with open(cls.DATA_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        if msgpack is None:
+            return None
+        try:
+            with open(cls._sidecar_path(), "rb") as f:
+                packed = f.read()
+            stored_signature, data = msgpack.unpackb(packed, raw=False)
+        except (OSError, TypeError, ValueError, msgpack.UnpackException):
+            return None
+        if tuple(stored_signature) != signature:
+            return None
+        return data, lambda: msgpack.unpackb(packed, raw=False)[1]
+
+    @classmethod
+    def _write_sidecar(cls, signature: Tuple[Any, ...], data: Dict[str, Any]) -> None:
+        """Store freshly parsed JSON as a MessagePack sidecar for later loads.
+
+        It is written from the parsed document rather than on save, so it
+        always holds exactly what the JSON parses to.
+        """
+        if msgpack is None:
+            return
+        try:
+            # The sidecar holds the same keys and hashes as the JSON file, so
+            # it must be no more readable than that file.
+            _atomic_write(
+                cls._sidecar_path(),
+                msgpack.packb([list(signature), data]),
+                mode=_target_mode(Path(cls.DATA_FILE)),
+            )
+        except (OSError, OverflowError, TypeError, ValueError):
+            pass  # a missing sidecar only costs the JSON parse next time
 
     @classmethod
     def save_all(cls, data: Dict[str, Any]) -> None:
         """Persist the provided dict to the data file atomically.
 
         The implementation writes to a temporary file then renames it to avoid
-        truncation on unexpected failures.
+        truncation on unexpected failures. Inside a batch the write is deferred
+        until the batch ends.
+        """
+        cls._indexes = {}
+        if cls._batch_depth:
+            cls._batch_data = data
+            cls._batch_dirty = True
+            return
+        cls._write(data)
+
+    @classmethod
+    def _file_signature(cls) -> Optional[Tuple[Any, ...]]:
+        """Identify the current on-disk version of DATA_FILE.
+
+        Writes go through os.replace, so every save produces a new inode; the
+        mtime and size also catch edits made by other tools.
+        """
+        try:
+            st = os.stat(cls.DATA_FILE)
+        except FileNotFoundError:
+            return None
+        return cls._stat_signature(st)
+
+    @classmethod
+    def _stat_signature(cls, st: os.stat_result) -> Tuple[Any, ...]:
+        return (str(cls.DATA_FILE), st.st_ino, st.st_mtime_ns, st.st_size)
+
+    @classmethod
+    def version(cls) -> Optional[Tuple[Any, ...]]:
+        """Return a token that changes whenever the stored data may have changed.
+
+        Callers can use it to validate their own derived caches. Returns None
+        while a batch is open (the pending snapshot has no stable version) or
+        when the data file does not exist; None should never be treated as a
+        cache hit.
         """
+        if cls._batch_depth:
+            return None
+        return cls._file_signature()
+
+    @classmethod
+    def _write(cls, data: Dict[str, Any]) -> None:
         # Ensure the target directory exists (but don't call ensure_data_file to avoid recursion)
         Path(cls.DATA_FILE).parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = Path(cls.DATA_FILE).with_suffix(".tmp")
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-        os.replace(tmp_path, cls.DATA_FILE)
+        # The written dict may hold values (e.g. datetimes) that read back
+        # differently, and on failure it holds unsaved mutations; either way
+        # the next load_all() must parse the file again.
+        cls._cache = None
+        _atomic_write(Path(cls.DATA_FILE), _dumps(data))
+        cls._written_signature = cls._file_signature()
+
+    # -----------------------------
+    # Batched writes
+    # -----------------------------
+    @classmethod
+    def begin_batch(cls) -> None:
+        """Start deferring writes; calls may be nested."""
+        cls._batch_depth += 1
+
+    @classmethod
+    def end_batch(cls) -> None:
+        """Close a batch level, flushing pending changes when the outermost ends."""
+        if cls._batch_depth == 0:
+            return
+        cls._batch_depth -= 1
+        if cls._batch_depth == 0:
+            data, dirty = cls._batch_data, cls._batch_dirty
+            cls._batch_data = None
+            cls._batch_dirty = False
+            if dirty:
+                cls._write(data)
+
+    @classmethod
+    @contextmanager
+    def batch(cls) -> Iterator[None]:
+        """Group several mutations into a single file write.
+
+        Example::
+
+            with DataStore.batch():
+                DataStore.append_to_collection("patients", p1)
+                DataStore.upsert("carestaffs", "id", cs)
+        """
+        cls.begin_batch()
+        try:
+            yield
+        finally:
+            cls.end_batch()
 
     @classmethod
     def get_collection(cls, name: str) -> List[Any]:
-        data = cls.load_all()
-        return data.get(name, [])
+        """Return a copy of collection `name` (empty if it does not exist)."""
+        return _copy(cls._load().get(name, []))
 
     @classmethod
     def set_collection(cls, name: str, values: List[Any]) -> None:
-        data = cls.load_all()
+        data = cls._load()
         data[name] = values
         cls.save_all(data)
 
     @classmethod
     def append_to_collection(cls, name: str, item: Any) -> None:
-        data = cls.load_all()
+        data = cls._load()
         data.setdefault(name, []).append(item)
         cls.save_all(data)
 
@@ -94,7 +379,7 @@ class DataStore:
 
         If an object with the same id exists, it is replaced; otherwise, it is appended.
         """
-        data = cls.load_all()
+        data = cls._load()
         items = data.setdefault(collection, [])
         key = item.get(id_key)
         if key is None:
@@ -114,17 +399,34 @@ class DataStore:
     def get_by_id(
         cls, collection: str, id_key: str, id_value: Any
     ) -> Optional[Dict[str, Any]]:
-        items = cls.get_collection(collection)
-        for item in items:
-            if isinstance(item, dict) and item.get(id_key) == id_value:
-                return item
-        return None
+        """Return the first object in `collection` whose `id_key` equals `id_value`.
+
+        Lookups go through a hash index built on first use, so repeated calls
+        cost O(1) instead of scanning the collection. The returned dict is a
+        copy, so mutating it does not affect later reads until it is saved.
+        """
+        signature = cls._file_signature()
+        if signature != cls._index_signature:
+            cls._indexes = {}
+        index = cls._indexes.get((collection, id_key))
+        if index is None:
+            index = {}
+            for item in cls._load().get(collection, []):
+                if isinstance(item, dict):
+                    index.setdefault(item.get(id_key), item)
+            cls._indexes[(collection, id_key)] = index
+            cls._index_signature = cls._file_signature()
+        try:
+            return _copy(index.get(id_value))
+        except TypeError:
+            # Unhashable lookup values cannot match a JSON scalar id.
+            return None
 
     @classmethod
     def delete_by_id(
         cls, collection: str, id_key: str, id_value: Any
     ) -> bool:
-        data = cls.load_all()
+        data = cls._load()
         items = data.setdefault(collection, [])
         new_items = [it for it in items if not (isinstance(it, dict) and it.get(id_key) == id_value)]
         changed = len(new_items) != len(items)
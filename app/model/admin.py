@@ -9,15 +9,79 @@ The public methods keep the original names and behavior where reasonable
 but delegate storage/serialization to the models.
 """
 
-from typing import Iterable, List, Any
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from app.model.user import User
 from app.model.patient import Patient
 from app.model.carestaff import CareStaff
 from app.data.datastore import DataStore
 
-import bcrypt
-salt = bcrypt.gensalt()
+
+def _print_records(records: Iterable[Dict[str, Any]], separator: str | None = None) -> None:
+    """Print each record as ``key: value`` lines with a single write.
+
+    When `separator` is given it is printed on its own line before every record.
+    """
+    lines: List[str] = []
+    for record in records:
+        if separator is not None:
+            lines.append(separator)
+        lines.extend(f"{k}: {v}" for k, v in record.items())
+    if lines:
+        print("\n".join(lines))
+
+
+def _join_rows(texts: List[str]) -> Tuple[str, List[int]]:
+    """Join per-row search texts with \\1 and return (haystack, row start offsets)."""
+    offsets: List[int] = []
+    pos = 0
+    for text in texts:
+        offsets.append(pos)
+        pos += len(text) + 1
+    return "\1".join(texts), offsets
+
+
+def _matching_rows(haystack: str, offsets: List[int], needle: str) -> List[int]:
+    """Return the indexes of rows in a _join_rows() haystack that contain `needle`.
+
+    The scan is a loop of C-level str.find calls; each hit is mapped to its
+    row with bisect and the search resumes at the next row, so every row is
+    reported at most once. Needles containing a separator never match.
+    """
+    rows: List[int] = []
+    if not offsets or "\0" in needle or "\1" in needle:
+        return rows
+    start = 0
+    end = len(haystack)
+    last = len(offsets) - 1
+    while True:
+        hit = haystack.find(needle, start, end)
+        if hit < 0:
+            break
+        row = bisect_right(offsets, hit) - 1
+        rows.append(row)
+        if row >= last:
+            break
+        start = offsets[row + 1]
+    return rows
+
+
+_PATIENT_ROW_FIELDS = ("id", "key", "name", "email", "phone", "password_hash")
+
+
+@lru_cache(maxsize=1024)
+def _decrypt_patient_row(row: Tuple[Any, ...]) -> Tuple[str, str, str]:
+    """Return (name, email, phone) plaintext for a stored patient row.
+
+    `row` is the row's values in _PATIENT_ROW_FIELDS order. Keying on the
+    ciphertext itself keeps the cache coherent without any invalidation: an
+    updated patient produces a different key.
+    """
+    p = Patient.patient_from_dict(dict(zip(_PATIENT_ROW_FIELDS, row)))
+    return p.decrypted_name, p.decrypted_email, p.decrypted_phone
+
 
 class Admin(User):
     """Admin helper to manage patients and care staff via model classes.
@@ -27,7 +91,22 @@ class Admin(User):
     class will attempt to construct the appropriate model object before
     persisting.
     """
-    
+
+    # User is a slotted dataclass; declaring the one extra attribute keeps
+    # Admin instances free of a __dict__ as well.
+    __slots__ = ("phone",)
+
+    # Lowercased plaintext for keyword search, keyed by patient id. Each entry
+    # remembers the ciphertext it was decrypted from, so a row changed behind
+    # our back is simply decrypted again.
+    _patient_search_cache: Dict[str, Tuple[Tuple[Any, ...], str]] = {}
+    # Every row's search text joined into one string, plus the start offset
+    # of each row, so a query is a C-level str.find scan instead of a Python
+    # loop. Stored as (DataStore.version(), rows, haystack, offsets).
+    _patient_haystack: Optional[Tuple[Any, List[dict], str, List[int]]] = None
+    # Same layout for carestaffs, built from casefolded plaintext fields.
+    _carestaff_haystack: Optional[Tuple[Any, List[dict], str, List[int]]] = None
+
     @classmethod
     def all_admin_ids(cls) -> List[str]:
         """Return a list of all admin IDs in the system."""
@@ -52,29 +131,31 @@ class Admin(User):
         (id, name, email, phone, password).
         """
         added = []
-        for item in patients:
-            if isinstance(item, Patient):
-                DataStore.append_to_collection("patients", item.to_dict())
-                added.append(item.to_dict())
-            elif isinstance(item, dict):
-                # Construct Patient from plain dict (expects plain PHI and a password)
-                p = Patient(
-                    id=item.get("id"),
-                    name=item.get("name"),
-                    email=item.get("email"),
-                    phone=item.get("phone"),
-                    password=item.get("password") or item.get("password_hash"),
-                )
-                DataStore.append_to_collection("patients", p.to_dict())
-                added.append(p.to_dict())
-            else:
-                # unknown object: ignore for robustness
-                continue
+        # Defer persistence so the whole set is written to disk once.
+        with DataStore.batch():
+            for item in patients:
+                if isinstance(item, Patient):
+                    patient = item
+                elif isinstance(item, dict):
+                    # Construct Patient from plain dict (expects plain PHI and a password)
+                    patient = Patient(
+                        id=item.get("id"),
+                        name=item.get("name"),
+                        email=item.get("email"),
+                        phone=item.get("phone"),
+                        password=item.get("password") or item.get("password_hash"),
+                    )
+                else:
+                    # unknown object: ignore for robustness
+                    continue
+                # Serialize once; the same dict is stored and reported.
+                record = patient.to_dict()
+                DataStore.append_to_collection("patients", record)
+                added.append(record)
+                self._forget_patient_search(patient.id)
 
         print("Patient(s) added successfully!")
-        for patient in added:
-            for k, v in patient.items():
-                print(f"{k}: {v}")
+        _print_records(added)
 
     def update_patients_information(self, id: str, choice: int, information: str) -> bool:
         """Update patient's name/email/phone.
@@ -90,9 +171,9 @@ class Admin(User):
         # Reconstruct Patient to get plaintext values
         try:
             existing = Patient.patient_from_dict(stored)
-            plain_name = existing.get_decrypted_name()
-            plain_email = existing.get_decrypted_email()
-            plain_phone = existing.get_decrypted_phone()
+            plain_name = existing.decrypted_name
+            plain_email = existing.decrypted_email
+            plain_phone = existing.decrypted_phone
         except Exception:
             # If reconstruction fails, fall back to raw dict values
             plain_name = stored.get("name")
@@ -118,26 +199,27 @@ class Admin(User):
             password_hash=stored.get("password_hash"),
             key=bytes.fromhex(stored.get("key")) if stored.get("key") else None,
         )
-        DataStore.upsert("patients", "id", new_patient.to_dict())
+        record = new_patient.to_dict()
+        DataStore.upsert("patients", "id", record)
+        self._forget_patient_search(new_patient.id)
 
         print(f"Patient information for patient ID {new_patient.id} successfully changed!")
-        for k, v in new_patient.to_dict().items():
-            print(f"{k}: {v}")
+        _print_records([record])
         return True
 
     def remove_patients(self, id_list: Iterable[str]) -> None:
         """Remove patients by id list."""
         removed = []
-        for pid in id_list:
-            stored = DataStore.get_by_id("patients", "id", pid)
-            if stored:
-                removed.append(stored)
-                DataStore.delete_by_id("patients", "id", pid)
+        with DataStore.batch():
+            for pid in id_list:
+                stored = DataStore.get_by_id("patients", "id", pid)
+                if stored:
+                    removed.append(stored)
+                    DataStore.delete_by_id("patients", "id", pid)
+                self._forget_patient_search(pid)
 
         print("Patient(s) removed successfully!")
-        for p in removed:
-            for k, v in p.items():
-                print(f"{k}: {v}")
+        _print_records(removed)
 
     # ----------------------- CareStaffs ---------------------------------
     def add_new_carestaffs(self, carestaffs: Iterable[Any]) -> None:
@@ -146,19 +228,22 @@ class Admin(User):
         Accepts CareStaff instances or dicts with fields accepted by CareStaff.from_dict.
         """
         added = []
-        for item in carestaffs:
-            if isinstance(item, CareStaff):
-                item.save()
-                added.append(item.to_dict())
-            elif isinstance(item, dict):
-                cs = CareStaff.from_dict(item)
-                cs.save()
-                added.append(cs.to_dict())
+        with DataStore.batch():
+            for item in carestaffs:
+                if isinstance(item, CareStaff):
+                    cs = item
+                elif isinstance(item, dict):
+                    cs = CareStaff.from_dict(item)
+                else:
+                    continue
+                # Same write as CareStaff.save(), reusing the serialized dict.
+                record = cs.to_dict()
+                DataStore.upsert("carestaffs", "id", record)
+                added.append(record)
+        self._forget_carestaff_search()
 
         print("Carestaff(s) added successfully!")
-        for cs in added:
-            for k, v in cs.items():
-                print(f"{k}: {v}")
+        _print_records(added)
 
     def update_carestaffs_information(self, id: str, department: str, specialization: str) -> bool:
         """Update carestaff department and specialization."""
@@ -168,26 +253,27 @@ class Admin(User):
             return False
         cs.department = department
         cs.specialization = specialization
-        cs.save()
+        record = cs.to_dict()
+        DataStore.upsert("carestaffs", "id", record)
+        self._forget_carestaff_search()
 
         print(f"Carestaff information for carestaff ID {id} successfully changed!")
-        for k, v in cs.to_dict().items():
-            print(f"{k}: {v}")
+        _print_records([record])
         return True
 
     def remove_carestaffs(self, id_list: Iterable[str]) -> None:
         """Remove carestaff(s) by id list."""
         removed = []
-        for cid in id_list:
-            stored = DataStore.get_by_id("carestaffs", "id", cid)
-            if stored:
-                removed.append(stored)
-                DataStore.delete_by_id("carestaffs", "id", cid)
+        with DataStore.batch():
+            for cid in id_list:
+                stored = DataStore.get_by_id("carestaffs", "id", cid)
+                if stored:
+                    removed.append(stored)
+                    DataStore.delete_by_id("carestaffs", "id", cid)
+        self._forget_carestaff_search()
 
         print("Carestaff(s) removed successfully!")
-        for cs in removed:
-            for k, v in cs.items():
-                print(f"{k}: {v}")
+        _print_records(removed)
 
     # ----------------------- Search / Queries ---------------------------
     def search_patient_information(self, id: str) -> None:
@@ -197,17 +283,16 @@ class Admin(User):
             print("Patient not found! Please try again.")
             return
         try:
-            p = Patient.patient_from_dict(stored)
+            name, email, phone = _decrypt_patient_row(tuple(stored.get(f) for f in _PATIENT_ROW_FIELDS))
             print("Patient found! The following are the patient's information found:")
-            print(f"id: {p.id}")
-            print(f"name: {p.get_decrypted_name()}")
-            print(f"email: {p.get_decrypted_email()}")
-            print(f"phone: {p.get_decrypted_phone()}")
+            print(f"id: {stored.get('id')}")
+            print(f"name: {name}")
+            print(f"email: {email}")
+            print(f"phone: {phone}")
         except Exception:
             # Fallback to raw dict print
             print("Patient found! The following are the patient's information found:")
-            for k, v in stored.items():
-                print(f"{k}: {v}")
+            _print_records([stored])
 
     def number_of_patients(self, id: str) -> int | None:
         """Return number of patients assigned to a carestaff."""
@@ -220,49 +305,96 @@ class Admin(User):
 
     def search_carestaffs_by_keyword(self, keyword: str) -> None:
         """Search carestaffs by name/department/specialization."""
-        all_cs = DataStore.get_collection("carestaffs")
-        found = []
-        for cs in all_cs:
-            name = (cs.get("name") or "").lower()
-            dept = (cs.get("department") or "").lower()
-            spec = (cs.get("specialization") or "").lower()
-            if keyword.lower() in name or keyword.lower() in dept or keyword.lower() in spec:
-                found.append(cs)
+        rows, haystack, offsets = self._build_carestaff_haystack()
+        found = [rows[i] for i in _matching_rows(haystack, offsets, keyword.casefold())]
 
         if found:
             print(f"{len(found)} carestaff(s) found matching the keyword '{keyword}':")
-            for cs in found:
-                print("-----")
-                for k, v in cs.items():
-                    print(f"{k}: {v}")
+            _print_records(found, separator="-----")
         else:
             print(f"No carestaff found matching the keyword '{keyword}'.")
 
+    @classmethod
+    def _forget_carestaff_search(cls) -> None:
+        """Drop the carestaff search buffer after Admin changed carestaff records."""
+        cls._carestaff_haystack = None
+
+    @classmethod
+    def _build_carestaff_haystack(cls) -> Tuple[List[dict], str, List[int]]:
+        """Return (rows, haystack, offsets) for the stored carestaffs, rebuilding if stale."""
+        version = DataStore.version()
+        cached = cls._carestaff_haystack
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1], cached[2], cached[3]
+
+        rows = DataStore.get_collection("carestaffs")
+        # Casefold the whole buffer in one call rather than once per row.
+        texts = [
+            f"{cs.get('name') or ''}\0{cs.get('department') or ''}\0{cs.get('specialization') or ''}"
+            for cs in rows
+        ]
+        haystack, offsets = _join_rows(texts)
+        folded = haystack.casefold()
+        if len(folded) != len(haystack):
+            # Some character expanded when folded (e.g. "ß" -> "ss"); offsets must be rebuilt.
+            folded, offsets = _join_rows([t.casefold() for t in texts])
+        cls._carestaff_haystack = (version, rows, folded, offsets)
+        return rows, folded, offsets
+
+    @classmethod
+    def _patient_search_text(cls, p: dict) -> str:
+        """Return the lowercased, searchable plaintext for a stored patient row.
+
+        Decryption only happens the first time a row is seen (or after its
+        ciphertext changes); later searches reuse the cached text.
+        """
+        fingerprint = (p.get("key"), p.get("name"), p.get("email"), p.get("phone"))
+        pid = p.get("id")
+        cached = cls._patient_search_cache.get(pid)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        try:
+            obj = Patient.patient_from_dict(p)
+            name = obj.decrypted_name
+            email = obj.decrypted_email
+            phone = obj.decrypted_phone
+        except Exception:
+            # fall back to raw stored values
+            name = p.get("name") or ""
+            email = p.get("email") or ""
+            phone = p.get("phone") or ""
+        # NUL-separated so a keyword can never match across two fields.
+        text = "\0".join((name, email, phone)).lower()
+        cls._patient_search_cache[pid] = (fingerprint, text)
+        return text
+
+    @classmethod
+    def _forget_patient_search(cls, pid: str) -> None:
+        """Drop cached search data after patient `pid` was added, changed or removed."""
+        cls._patient_search_cache.pop(pid, None)
+        cls._patient_haystack = None
+
+    @classmethod
+    def _build_patient_haystack(cls) -> Tuple[List[dict], str, List[int]]:
+        """Return (rows, haystack, offsets) for the stored patients, rebuilding if stale."""
+        version = DataStore.version()
+        cached = cls._patient_haystack
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1], cached[2], cached[3]
+
+        rows = DataStore.get_collection("patients")
+        haystack, offsets = _join_rows([cls._patient_search_text(p) for p in rows])
+        cls._patient_haystack = (version, rows, haystack, offsets)
+        return rows, haystack, offsets
+
     def search_patients_by_keyword(self, keyword: str) -> None:
         """Search patients by decrypted name/email/phone."""
-        all_pat = DataStore.get_collection("patients")
-        found = []
-        for p in all_pat:
-            try:
-                obj = Patient.patient_from_dict(p)
-                name = obj.get_decrypted_name().lower()
-                email = obj.get_decrypted_email().lower()
-                phone = obj.get_decrypted_phone().lower()
-            except Exception:
-                # fall back to raw stored values
-                name = (p.get("name") or "").lower()
-                email = (p.get("email") or "").lower()
-                phone = (p.get("phone") or "").lower()
-
-            if keyword.lower() in name or keyword.lower() in email or keyword.lower() in phone:
-                found.append(p)
+        rows, haystack, offsets = self._build_patient_haystack()
+        found = [rows[i] for i in _matching_rows(haystack, offsets, keyword.lower())]
 
         if found:
             print(f"{len(found)} patient(s) found matching the keyword '{keyword}':")
-            for pat in found:
-                print("-----")
-                for k, v in pat.items():
-                    print(f"{k}: {v}")
+            _print_records(found, separator="-----")
         else:
             print(f"No patient found matching the keyword '{keyword}'.")
     @classmethod
@@ -292,7 +424,7 @@ class Admin(User):
         `id` so the record can be retrieved by older code that expects that shape.
         Returns an Admin instance.
         """
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+        hashed_password = cls.hash_password(password)
         admin = cls(
             name,
             id,
@@ -5,7 +5,6 @@ from datetime import datetime
 from typing import Any, Dict, List
 
 from colorama import Fore, Style
-import bcrypt
 
 from app.model.schedule import Schedule, Task
 from app.data.datastore import DataStore
@@ -16,11 +15,24 @@ from .note import Note
 from .user import User
 from .food import FoodToDeliver
 
-salt = bcrypt.gensalt()
 
 class CareStaff(User):
     """Hybrid domain/service class representing a member of the care team."""
 
+    # User is a slotted dataclass; subclasses declare their own attributes
+    # too, otherwise every instance would get a __dict__ again.
+    __slots__ = (
+        "staff_id",
+        "department",
+        "specialization",
+        "assigned_patients",
+        "work_schedule",
+        "tasks",
+        "alerts",
+        "assignments",
+        "notification_service",
+    )
+
     def __init__(
         self,
         name: str,
@@ -269,6 +281,8 @@ class CareStaff(User):
 class Doctor(CareStaff):
     """Specialised care staff capable of managing medical treatment plans."""
 
+    __slots__ = ("license_number", "certifications", "appointment_list", "work_to_do", "patient_records")
+
     def __init__(
         self,
         name: str,
@@ -374,7 +388,7 @@ class Doctor(CareStaff):
                 change.get("description", "") or 
                 change.get("medications", "") or 
                 str(change) 
-                for change in record.history
+                for change in record.get_full_history()
             ]
         return []
 
@@ -424,7 +438,7 @@ class Doctor(CareStaff):
     def register(cls, name: str, carestaff_id: str, license_number: str, email: str, password: str, 
                  department: str = "", specialization: str = "") -> Doctor:
         """Register a new doctor in the system."""
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        hashed_password = cls.hash_password(password)
         doctor = cls(
             name,
             carestaff_id,
@@ -442,6 +456,8 @@ class Doctor(CareStaff):
 class Nurse(CareStaff):
     """Care staff member focused on day-to-day patient support."""
 
+    __slots__ = ("license_number", "qualifications", "food_deliveries", "work_to_do", "vital_signs")
+
     def __init__(
         self,
         name: str,
@@ -582,7 +598,7 @@ class Nurse(CareStaff):
     def register(cls, name: str, carestaff_id: str, license_number: str, email: str, password: str, 
                  department: str = "", qualifications: List[str] = []) -> Nurse:
         """Register a new nurse in the system."""
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        hashed_password = cls.hash_password(password)
         nurse = cls(
             name,
             carestaff_id,
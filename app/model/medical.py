@@ -1,8 +1,63 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, ClassVar, Dict, List, Optional
+
+from app.data.datastore import DataStore
+
+# Change entries kept inline on a record. When a record with more than
+# HISTORY_LIMIT entries is saved, all but the newest HISTORY_KEEP move to the
+# HISTORY_ARCHIVE collection in the same write, so the audit trail is never
+# dropped and the archive grows once per HISTORY_LIMIT - HISTORY_KEEP changes.
+HISTORY_LIMIT = 200
+HISTORY_KEEP = HISTORY_LIMIT // 2
+HISTORY_ARCHIVE = "medical_history_archive"
+
+
+def _parse_iso_or_now(value: Any) -> datetime:
+    """Parse an ISO timestamp, falling back to now when it is missing."""
+    if not value:
+        return datetime.now()
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _parse_base(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the MedicalRecord constructor arguments shared by all subclasses."""
+    return {
+        "record_id": data.get("recordID", ""),
+        "created_at": _parse_iso_or_now(data.get("createdAt")),
+        "updated_at": _parse_iso_or_now(data.get("updatedAt")),
+        "created_by": data.get("createdBy", ""),
+        "history": list(data.get("history", [])),
+        "archived_count": int(data.get("archivedCount", 0)),
+    }
+
+
+class _UpdatedAt:
+    """Descriptor behind the MedicalRecord.updated_at field.
+
+    log_change() stores a time.time_ns() integer in ``_updated_ns``; the
+    datetime is built the first time it is read and kept in ``_updated_dt``.
+    """
+
+    def __get__(self, obj: Optional["MedicalRecord"], owner: type = None) -> datetime:
+        if obj is None:
+            # Raised on class access so @dataclass gives the field no default.
+            raise AttributeError("updated_at")
+        if obj._updated_dt is None:
+            ns = obj._updated_ns
+            obj._updated_dt = datetime.fromtimestamp(ns // 1_000_000_000).replace(
+                microsecond=ns // 1_000 % 1_000_000
+            )
+        return obj._updated_dt
+
+    def __set__(self, obj: "MedicalRecord", value: datetime) -> None:
+        obj._updated_dt = value
+        obj._updated_ns = None
 
 
 @dataclass
@@ -11,9 +66,16 @@ class MedicalRecord:
 
     record_id: str
     created_at: datetime
-    updated_at: datetime
+    updated_at: datetime = _UpdatedAt()
     created_by: str
     history: List[Dict[str, str]] = field(default_factory=list)
+    # Entries already moved to HISTORY_ARCHIVE; the first inline entry is
+    # change number archived_count (0-based).
+    archived_count: int = 0
+
+    # When True, serialisation keeps native datetime objects and leaves the
+    # encoding to the JSON backend (DataStore knows how to write them).
+    SERIALIZE_DATETIME_AS_OBJECT: ClassVar[bool] = False
 
     def __post_init__(self) -> None:
         # Default timestamps to now when not explicitly provided.
@@ -27,6 +89,26 @@ class MedicalRecord:
         """Return a shallow copy of the change log for display purposes."""
         return list(self.history)
 
+    def get_full_history(self) -> List[Dict[str, str]]:
+        """Return archived and inline change entries, oldest first.
+
+        Archive batches carry the change number of their first entry, so a
+        batch archived twice (e.g. from two copies of the record) is only
+        counted once.
+        """
+        by_position: Dict[int, Dict[str, str]] = {}
+        for batch in DataStore.get_collection(HISTORY_ARCHIVE):
+            if isinstance(batch, dict) and batch.get("recordID") == self.record_id:
+                start = batch.get("start", 0)
+                for offset, entry in enumerate(batch.get("entries", [])):
+                    by_position[start + offset] = entry
+        archived = [by_position[i] for i in sorted(by_position) if i < self.archived_count]
+        return archived + self.history
+
+    def change_count(self) -> int:
+        """Return the number of changes ever logged, archived ones included."""
+        return self.archived_count + len(self.history)
+
     def validate_data(self) -> bool:
         """Ensure required fields are available before persisting the record."""
         return bool(self.record_id and self.created_by)
@@ -34,18 +116,39 @@ class MedicalRecord:
     def log_change(self, change: Dict[str, str]) -> None:
         """Append a change entry and update the modification timestamp."""
         self.history.append(change)
-        self.updated_at = datetime.now()
+        # Record a plain integer; the datetime is only built if someone reads it.
+        self._updated_ns = time.time_ns()
+        self._updated_dt = None
+
+    def _save(self, collection: str) -> None:
+        """Upsert the record, archiving history overflow in the same write."""
+        with DataStore.batch():
+            if len(self.history) > HISTORY_LIMIT:
+                overflow = self.history[:-HISTORY_KEEP]
+                DataStore.append_to_collection(
+                    HISTORY_ARCHIVE,
+                    {"recordID": self.record_id, "start": self.archived_count, "entries": overflow},
+                )
+                del self.history[:-HISTORY_KEEP]
+                self.archived_count += len(overflow)
+            DataStore.upsert(collection, "recordID", self.to_dict())
 
     # -----------------------------
     # Serialization helpers
     # -----------------------------
+    def _serialize_datetime(self, value: datetime) -> Any:
+        if self.SERIALIZE_DATETIME_AS_OBJECT:
+            return value
+        return value.isoformat()
+
     def to_base_dict(self) -> Dict[str, Any]:
         return {
             "recordID": self.record_id,
-            "createdAt": self.created_at.isoformat(),
-            "updatedAt": self.updated_at.isoformat(),
+            "createdAt": self._serialize_datetime(self.created_at),
+            "updatedAt": self._serialize_datetime(self.updated_at),
             "createdBy": self.created_by,
             "history": list(self.history),
+            "archivedCount": self.archived_count,
         }
 
 
@@ -63,22 +166,20 @@ class MedicalDetails(MedicalRecord):
 
     def update_description(self, new_description: str) -> bool:
         """Update the descriptive summary of the current diagnosis."""
-        from app.data.datastore import DataStore
         if not new_description:
             return False
         self.description = new_description
         self.log_change({"description": new_description})
-        DataStore.upsert("medical_details", "recordID", self.to_dict())
+        self._save("medical_details")
         return True
 
     def update_medication(self, medication_list: List[str]) -> bool:
         """Replace the current medication plan with a new list."""
-        from app.data.datastore import DataStore
         if medication_list is None:
             return False
         self.medications = medication_list
         self.log_change({"medications": ",".join(medication_list)})
-        DataStore.upsert("medical_details", "recordID", self.to_dict())
+        self._save("medical_details")
         return True
 
     def medication_recommendation(self) -> List[str]:
@@ -90,7 +191,7 @@ class MedicalDetails(MedicalRecord):
         return {
             "status": self.status,
             "last_updated": self.updated_at.isoformat(),
-            "treatments_completed": str(len(self.history)),
+            "treatments_completed": str(self.change_count()),
         }
 
     def to_dict(self) -> Dict[str, Any]:
@@ -112,11 +213,7 @@ class MedicalDetails(MedicalRecord):
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "MedicalDetails":
         return cls(
-            record_id=data.get("recordID", ""),
-            created_at=datetime.fromisoformat(data.get("createdAt")) if data.get("createdAt") else datetime.now(),
-            updated_at=datetime.fromisoformat(data.get("updatedAt")) if data.get("updatedAt") else datetime.now(),
-            created_by=data.get("createdBy", ""),
-            history=list(data.get("history", [])),
+            **_parse_base(data),
             sickness_name=data.get("sicknessName", ""),
             department=data.get("department", ""),
             severity=data.get("severity", ""),
@@ -139,48 +236,43 @@ class PatientLog(MedicalRecord):
     feedback: List[str] = field(default_factory=list)
 
     def update_personal_feeling(self, feeling: str) -> bool:
-        from app.data.datastore import DataStore
         if not feeling:
             return False
         self.personal_feeling = feeling
         self.log_change({"personal_feeling": feeling})
-        DataStore.upsert("patient_logs", "recordID", self.to_dict())
+        self._save("patient_logs")
         return True
 
     def update_physical_condition(self, condition: str) -> bool:
-        from app.data.datastore import DataStore
         if not condition:
             return False
         self.physical_condition = condition
         self.log_change({"physical_condition": condition})
-        DataStore.upsert("patient_logs", "recordID", self.to_dict())
+        self._save("patient_logs")
         return True
 
     def update_medical_condition(self, condition: str) -> bool:
-        from app.data.datastore import DataStore
         if not condition:
             return False
         self.medical_condition = condition
         self.log_change({"medical_condition": condition})
-        DataStore.upsert("patient_logs", "recordID", self.to_dict())
+        self._save("patient_logs")
         return True
 
     def update_social_wellbeing(self, wellbeing: str) -> bool:
-        from app.data.datastore import DataStore
         if not wellbeing:
             return False
         self.social_well_being = wellbeing
         self.log_change({"social_well_being": wellbeing})
-        DataStore.upsert("patient_logs", "recordID", self.to_dict())
+        self._save("patient_logs")
         return True
 
     def add_feedback(self, feedback: str) -> bool:
-        from app.data.datastore import DataStore
         if not feedback:
             return False
         self.feedback.append(feedback)
         self.log_change({"feedback": feedback})
-        DataStore.upsert("patient_logs", "recordID", self.to_dict())
+        self._save("patient_logs")
         return True
 
     def analyze_trends(self) -> Dict[str, str]:
@@ -209,11 +301,7 @@ class PatientLog(MedicalRecord):
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "PatientLog":
         return cls(
-            record_id=data.get("recordID", ""),
-            created_at=datetime.fromisoformat(data.get("createdAt")) if data.get("createdAt") else datetime.now(),
-            updated_at=datetime.fromisoformat(data.get("updatedAt")) if data.get("updatedAt") else datetime.now(),
-            created_by=data.get("createdBy", ""),
-            history=list(data.get("history", [])),
+            **_parse_base(data),
             personal_feeling=data.get("personalFeeling", ""),
             physical_condition=data.get("physicalCondition", ""),
             medical_condition=data.get("medicalCondition", ""),
@@ -236,35 +324,37 @@ class VitalSigns(MedicalRecord):
     oxygen_saturation: float = 0.0
     measured_at: datetime = field(default_factory=datetime.now)
 
+    # Thresholds shared with the columnar VitalSignsTable anomaly kernel.
+    TEMPERATURE_HIGH: ClassVar[float] = 38.0
+    OXYGEN_SATURATION_LOW: ClassVar[float] = 92.0
+    HEART_RATE_HIGH: ClassVar[int] = 120
+    HEART_RATE_LOW: ClassVar[int] = 50
+
     def record_vitals(self, vitals_data: Dict[str, float]) -> bool:
-        from app.data.datastore import DataStore
         if not vitals_data:
             return False
 
         # Update each known vital sign if present in the payload.
-        for field_name in (
-            "temperature",
-            "heart_rate",
-            "blood_pressure_systolic",
-            "blood_pressure_diastolic",
-            "respiratory_rate",
-            "oxygen_saturation",
-        ):
-            if field_name in vitals_data:
-                setattr(self, field_name, vitals_data[field_name])
+        vd = vitals_data
+        self.temperature = vd.get("temperature", self.temperature)
+        self.heart_rate = vd.get("heart_rate", self.heart_rate)
+        self.blood_pressure_systolic = vd.get("blood_pressure_systolic", self.blood_pressure_systolic)
+        self.blood_pressure_diastolic = vd.get("blood_pressure_diastolic", self.blood_pressure_diastolic)
+        self.respiratory_rate = vd.get("respiratory_rate", self.respiratory_rate)
+        self.oxygen_saturation = vd.get("oxygen_saturation", self.oxygen_saturation)
         self.measured_at = datetime.now()
         self.log_change({"measurement": self.measured_at.isoformat()})
-        DataStore.upsert("vital_signs", "recordID", self.to_dict())
+        self._save("vital_signs")
         return True
 
     def detect_anomalies(self) -> List[str]:
         """Evaluate simple thresholds to flag potential anomalies."""
         alerts: List[str] = []
-        if self.temperature > 38.0:
+        if self.temperature > self.TEMPERATURE_HIGH:
             alerts.append("High temperature")
-        if self.oxygen_saturation < 92.0:
+        if self.oxygen_saturation < self.OXYGEN_SATURATION_LOW:
             alerts.append("Low oxygen saturation")
-        if self.heart_rate > 120 or self.heart_rate < 50:
+        if self.heart_rate > self.HEART_RATE_HIGH or self.heart_rate < self.HEART_RATE_LOW:
             alerts.append("Abnormal heart rate")
         return alerts
 
@@ -288,7 +378,7 @@ class VitalSigns(MedicalRecord):
                 "bloodPressureDiastolic": self.blood_pressure_diastolic,
                 "respiratoryRate": self.respiratory_rate,
                 "oxygenSaturation": self.oxygen_saturation,
-                "measuredAt": self.measured_at.isoformat(),
+                "measuredAt": self._serialize_datetime(self.measured_at),
             }
         )
         return base
@@ -296,11 +386,7 @@ class VitalSigns(MedicalRecord):
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "VitalSigns":
         return cls(
-            record_id=data.get("recordID", ""),
-            created_at=datetime.fromisoformat(data.get("createdAt")) if data.get("createdAt") else datetime.now(),
-            updated_at=datetime.fromisoformat(data.get("updatedAt")) if data.get("updatedAt") else datetime.now(),
-            created_by=data.get("createdBy", ""),
-            history=list(data.get("history", [])),
+            **_parse_base(data),
             measurement_id=data.get("measurementID", ""),
             temperature=float(data.get("temperature", 0.0)),
             heart_rate=int(data.get("heartRate", 0)),
@@ -308,5 +394,5 @@ class VitalSigns(MedicalRecord):
             blood_pressure_diastolic=int(data.get("bloodPressureDiastolic", 0)),
             respiratory_rate=int(data.get("respiratoryRate", 0)),
             oxygen_saturation=float(data.get("oxygenSaturation", 0.0)),
-            measured_at=datetime.fromisoformat(data.get("measuredAt")) if data.get("measuredAt") else datetime.now(),
+            measured_at=_parse_iso_or_now(data.get("measuredAt")),
         )
@@ -1,11 +1,28 @@
+import time
 from datetime import datetime
 
+# (epoch second at the start of the minute, formatted timestamp)
+_minute_cache = [-1, ""]
+
+
+def _now_minute_str() -> str:
+    """Return the current local time as "%Y-%m-%d %H:%M", formatted once per minute."""
+    t = int(time.time())
+    minute = t - t % 60
+    if minute != _minute_cache[0]:
+        _minute_cache[1] = datetime.fromtimestamp(minute).strftime("%Y-%m-%d %H:%M")
+        _minute_cache[0] = minute
+    return _minute_cache[1]
+
+
 class Note:
+    __slots__ = ("id", "author", "content", "timestamp")
+
     def __init__(self, id, author, content):
         self.id = id
         self.author = author
         self.content = content
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+        self.timestamp = _now_minute_str()
 
     def to_dict(self):
         return {
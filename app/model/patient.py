@@ -1,10 +1,15 @@
 import os
 import hashlib
+import binascii
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.backends import default_backend
 try:
     from argon2 import PasswordHasher
+    # OWASP-recommended Argon2id profile (19 MiB, 2 iterations, 1 lane): far
+    # cheaper than the library defaults while still within guidance. Existing
+    # hashes keep verifying because their parameters are encoded in the hash.
+    _PH = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
 except ImportError:
     # Provide a lightweight fallback using bcrypt when argon2-cffi is not installed
     import bcrypt
@@ -23,13 +28,89 @@ except ImportError:
             except Exception:
                 return False
 
+    _PH = PasswordHasher()
+
+# The backend is a process-wide singleton, created once instead of on every
+# field operation. It is only needed to read legacy CBC tokens.
+_BACKEND = default_backend()
+
+# PHI tokens are "g64:" + base64(nonce || AES-GCM ciphertext and tag); base64
+# keeps them a third shorter than hex. Two older forms are still read:
+# "gcm:" + hex of the same bytes, and unprefixed hex(iv || ciphertext) from
+# the original AES-CBC scheme.
+GCM_PREFIX = "g64:"
+GCM_HEX_PREFIX = "gcm:"
+GCM_NONCE_SIZE = 12
+
+
+def encode_gcm_token(data: bytes) -> str:
+    """Wrap nonce || ciphertext as a "g64:" token."""
+    return GCM_PREFIX + binascii.b2a_base64(data, newline=False).decode("ascii")
+
+
+def decrypt_legacy_cbc(key: bytes, token: str) -> bytes:
+    """
+    Decrypt an unprefixed legacy token, hex(iv || AES-256-CBC ciphertext).
+    PKCS7 padding is checked and stripped inline rather than through the
+    cryptography padding context.
+    """
+    data = bytes.fromhex(token)
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(data[:16]), backend=_BACKEND).decryptor()
+    padded = decryptor.update(data[16:]) + decryptor.finalize()
+    pad = padded[-1] if padded else 0
+    if not 1 <= pad <= 16 or padded[-pad:] != bytes((pad,)) * pad:
+        raise ValueError("Invalid padding bytes.")
+    return padded[:-pad]
+
+
+def decode_gcm_token(token: str):
+    """Return the nonce || ciphertext bytes of a GCM token, or None for a legacy CBC token."""
+    if token.startswith(GCM_PREFIX):
+        return binascii.a2b_base64(token[len(GCM_PREFIX):])
+    if token.startswith(GCM_HEX_PREFIX):
+        return bytes.fromhex(token[len(GCM_HEX_PREFIX):])
+    return None
+
+_PHI_FIELDS = ("name", "email", "phone")
+
+
+def _load_master_key():
+    """Read the optional hex CARELOG_MASTER_KEY (16-64 bytes) from the environment."""
+    raw = os.environ.get("CARELOG_MASTER_KEY")
+    if not raw:
+        return None
+    try:
+        master = bytes.fromhex(raw)
+    except ValueError:
+        raise ValueError("CARELOG_MASTER_KEY must be a hex string.") from None
+    if not 16 <= len(master) <= 64:
+        raise ValueError("CARELOG_MASTER_KEY must decode to 16-64 bytes.")
+    return master
+
+
+# When a master key is configured, per-patient keys are derived from it with
+# keyed BLAKE2b over the patient id instead of drawn from os.urandom, so a
+# record whose "key" entry is missing can still be opened.
+_MASTER_KEY = _load_master_key()
+
+
+def derive_patient_key(patient_id: str):
+    """Return the AES-256 key for patient_id, or None without a master key."""
+    if _MASTER_KEY is None:
+        return None
+    return hashlib.blake2b(patient_id.encode(), key=_MASTER_KEY, digest_size=32,
+                           person=b"carelog-patient").digest()
+
 class   Patient:
     """
     Patient class represents a user in the CareLog system.
     Stores personal information and handles password hashing and PHI encryption.
     """
 
-    def __init__(self, id: str, name: str, email: str, phone: str, password: str = None, password_hash: str = None, key: bytes = None, iv: bytes = None, encrypted: bool = False):
+    # _plain memoizes decrypted fields; see _decrypted().
+    __slots__ = ("id", "key", "name", "email", "phone", "password_hash", "_plain")
+
+    def __init__(self, id: str, name: str, email: str, phone: str, password: str = None, password_hash: str = None, key: bytes = None, encrypted: bool = False):
         """
         Initialize a new Patient instance.
         Encrypt PHI fields if not already encrypted.
@@ -43,19 +124,27 @@ class   Patient:
             raise ValueError("Either password or password_hash must be provided.")
 
         self.id = id
-        # Generate encryption key and IV if not provided
-        self.key = key or self.generate_key()
-        self.iv = iv or os.urandom(16)
+        self._plain = {}
         if encrypted:
-            # Fields are already encrypted hex strings
+            # Reloading a stored record: fields are already encrypted hex
+            # strings and both the key and the hash must come from storage, so
+            # no key generation, encryption or password hashing happens here.
+            if not key or not password_hash:
+                raise ValueError("key and password_hash are required for encrypted records.")
+            self.key = key
             self.name = name
             self.email = email
             self.phone = phone
-        else:
-            # Encrypt fields for new registration
-            self.name = self.encrypt_field(name)
-            self.email = self.encrypt_field(email)
-            self.phone = self.encrypt_field(phone)
+            self.password_hash = password_hash
+            return
+
+        # Generate encryption key if not provided
+        self.key = key or self.generate_key()
+        # Encrypt fields for new registration in one pass
+        self.name, self.email, self.phone = self._encrypt_fields(name, email, phone)
+        # The plaintext is already known; seed the memo used by _decrypted()
+        for field, value in zip(_PHI_FIELDS, (name, email, phone)):
+            self._plain[field] = (self.key, getattr(self, field), value)
         # Only hash password if password_hash is not provided
         if password_hash:
             self.password_hash = password_hash
@@ -64,45 +153,42 @@ class   Patient:
 
     def generate_key(self) -> bytes:
         """
-        Generate a new AES-256 key for encryption.
+        Generate a new AES-256 key for encryption, derived from the master
+        key when CARELOG_MASTER_KEY is set.
         Store this securely in production!
         """
-        return os.urandom(32)  # 256 bits (AES-256)
+        return derive_patient_key(self.id) or os.urandom(32)  # 256 bits (AES-256)
+
+    def _encrypt_fields(self, *values: str) -> list:
+        """
+        Encrypt several fields with one AESGCM key schedule and a single
+        urandom call supplying a distinct 96-bit nonce for each field.
+        """
+        aead = AESGCM(self.key)
+        nonces = os.urandom(GCM_NONCE_SIZE * len(values))
+        tokens = []
+        for i, value in enumerate(values):
+            nonce = nonces[i * GCM_NONCE_SIZE:(i + 1) * GCM_NONCE_SIZE]
+            tokens.append(encode_gcm_token(nonce + aead.encrypt(nonce, value.encode(), None)))
+        return tokens
 
     def encrypt_field(self, value: str) -> str:
         """
-        Encrypt a field using AES-256 CBC mode.
-        Stores IV with encrypted data for later decryption.
-        """
-        backend = default_backend()
-        cipher = Cipher(algorithms.AES(self.key), modes.CBC(self.iv), backend=backend)
-        encryptor = cipher.encryptor()
-        # Pad the value to match AES block size using PKCS7
-        padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(value.encode()) + padder.finalize()
-        # Encrypt the padded data
-        encrypted = encryptor.update(padded_data) + encryptor.finalize()
-        # Concatenate IV and encrypted data, then encode as hex string
-        return (self.iv + encrypted).hex()
-
-    def decrypt_field(self, token: str) -> str:
-        """
-        Decrypt a field using AES-256 CBC mode.
-        Extracts IV from the start of the encrypted data.
-        """
-        backend = default_backend()
-        # Convert hex string back to bytes
-        data = bytes.fromhex(token)
-        # Extract IV (first 16 bytes) and encrypted data (rest)
-        iv = data[:16]
-        encrypted = data[16:]
-        cipher = Cipher(algorithms.AES(self.key), modes.CBC(iv), backend=backend)
-        decryptor = cipher.decryptor()
-        # Decrypt and remove PKCS7 padding
-        decrypted_padded = decryptor.update(encrypted) + decryptor.finalize()
-        unpadder = padding.PKCS7(128).unpadder()  # PKCS7 unpadder for AES block size
-        decrypted = unpadder.update(decrypted_padded) + unpadder.finalize()
-        return decrypted.decode()
+        Encrypt a field using AES-256-GCM.
+        Each call uses a fresh 96-bit nonce, stored in front of the ciphertext.
+        """
+        return self._encrypt_fields(value)[0]
+
+    def decrypt_field(self, token: str, aead: AESGCM = None) -> str:
+        """
+        Decrypt a field written by encrypt_field (AES-256-GCM), or a legacy
+        AES-256 CBC token that carries its IV in the first 16 bytes.
+        An AESGCM instance for self.key may be passed in to reuse it.
+        """
+        data = decode_gcm_token(token)
+        if data is not None:
+            return (aead or AESGCM(self.key)).decrypt(data[:GCM_NONCE_SIZE], data[GCM_NONCE_SIZE:], None).decode()
+        return decrypt_legacy_cbc(self.key, token).decode()
 
     def hash_password(self, password: str) -> str:
         """
@@ -111,37 +197,74 @@ class   Patient:
         """
         if not password or len(password) < 6:
             raise ValueError("Password must be at least 6 characters long.")
-        ph = PasswordHasher()
-        return ph.hash(password)
+        return _PH.hash(password)
 
     def verify_password(self, password: str) -> bool:
         """
         Verify password using Argon2.
         Returns True if password matches the stored hash, False otherwise.
         """
-        ph = PasswordHasher()
         try:
-            return ph.verify(self.password_hash, password)
+            return _PH.verify(self.password_hash, password)
         except Exception:
             return False
 
+    def _decrypted(self, field: str) -> str:
+        """
+        Return a PHI field's plaintext, decrypting at most once per (key, ciphertext).
+        A miss refreshes every stale PHI field with one shared AESGCM, since
+        callers almost always read name, email and phone together.
+        Assigning a new ciphertext or key makes the next access decrypt again.
+        """
+        cached = self._plain.get(field)
+        if cached is not None and cached[0] == self.key and cached[1] == getattr(self, field):
+            return cached[2]
+        aead = AESGCM(self.key)
+        for name in _PHI_FIELDS:
+            token = getattr(self, name)
+            cached = self._plain.get(name)
+            if cached is None or cached[0] != self.key or cached[1] != token:
+                self._plain[name] = (self.key, token, self.decrypt_field(token, aead))
+        return self._plain[field][2]
+
+    @property
+    def decrypted_name(self) -> str:
+        """
+        Decrypted name of the patient, computed on first access.
+        """
+        return self._decrypted("name")
+
+    @property
+    def decrypted_email(self) -> str:
+        """
+        Decrypted email of the patient, computed on first access.
+        """
+        return self._decrypted("email")
+
+    @property
+    def decrypted_phone(self) -> str:
+        """
+        Decrypted phone number of the patient, computed on first access.
+        """
+        return self._decrypted("phone")
+
     def get_decrypted_name(self) -> str:
         """
         Get the decrypted name of the patient.
         """
-        return self.decrypt_field(self.name)
+        return self.decrypted_name
 
     def get_decrypted_email(self) -> str:
         """
         Get the decrypted email of the patient.
         """
-        return self.decrypt_field(self.email)
+        return self.decrypted_email
 
     def get_decrypted_phone(self) -> str:
         """
         Get the decrypted phone number of the patient.
         """
-        return self.decrypt_field(self.phone)
+        return self.decrypted_phone
 
     def __repr__(self):
         """
@@ -155,6 +278,8 @@ class   Patient:
         Compare two Patient objects for equality.
         Checks all attributes including encrypted fields and password hash.
         """
+        if other is self:
+            return True
         if not isinstance(other, Patient):
             return NotImplemented
         return (self.id == other.id and 
@@ -162,16 +287,24 @@ class   Patient:
                 self.email == other.email and 
                 self.phone == other.phone and
                 self.password_hash == other.password_hash)
+
+    def __hash__(self):
+        """
+        Hash on the id, the one attribute that never changes after creation.
+        Equal patients share an id, so this agrees with __eq__; the PHI
+        tokens are reassigned on update and cannot be cached as a digest.
+        """
+        return hash(self.id)
     
     def to_dict(self):
         """
         Convert Patient instance to dictionary representation.
-        Saves key and iv as hex strings for storage.
+        Saves the key as a hex string for storage; each field token carries
+        its own nonce.
         """
         return {
             "id": self.id,
             "key": self.key.hex(),  
-            "iv": self.iv.hex(),    
             "name": self.name,
             "email": self.email,
             "phone": self.phone,
@@ -182,25 +315,37 @@ class   Patient:
     def patient_from_dict(cls, data: dict):
         """
         Create Patient instance from dictionary representation.
-        Loads key and iv from hex strings.
-        Validates required fields.
+        Loads the key from its hex string, or re-derives it from the master
+        key when the record has none.
+        Validates required fields. A legacy "iv" entry is ignored: CBC tokens
+        embed their IV as well.
         """
         # Validate required fields in dict
-        required = ["id", "name", "email", "phone", "password_hash", "key", "iv"]
+        required = ["id", "name", "email", "phone", "password_hash"]
+        if _MASTER_KEY is None:
+            required.append("key")
         for field in required:
             if field not in data or not data[field]:
                 raise ValueError(f"Missing required field: {field}")
-        key = bytes.fromhex(data["key"])
-        iv = bytes.fromhex(data["iv"])
-        return cls(
-            id=data["id"],
-            name=data["name"],
-            email=data["email"],
-            phone=data["phone"],
-            password_hash=data["password_hash"],  # Use stored hash
-            key=key,
-            iv=iv,
-            encrypted=True  # Indicate fields are already encrypted
-        )
+        key = bytes.fromhex(data["key"]) if data.get("key") else derive_patient_key(data["id"])
+        # The dict was validated above, so skip __init__ and its checks
+        return cls._raw(data["id"], key, data["name"], data["email"],
+                        data["phone"], data["password_hash"])
+
+    @classmethod
+    def _raw(cls, id: str, key: bytes, name: str, email: str, phone: str, password_hash: str):
+        """
+        Build a Patient from already encrypted, already validated values
+        without running __init__. Used for bulk reloads from storage.
+        """
+        obj = cls.__new__(cls)
+        obj.id = id
+        obj.key = key
+        obj.name = name
+        obj.email = email
+        obj.phone = phone
+        obj.password_hash = password_hash
+        obj._plain = {}
+        return obj
 
 
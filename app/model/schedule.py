@@ -2,13 +2,24 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from hashlib import blake2b
 from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
     from app.model.carestaff import CareStaff
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """datetime.fromisoformat, memoized: bulk loads repeat the same due dates and slots.
+
+    Sharing results is safe because datetime objects are immutable.
+    """
+    return datetime.fromisoformat(value)
+
+
+@dataclass(slots=True)
 class Task:
     """Actionable item assigned to a member of the care team."""
 
@@ -67,19 +78,34 @@ class Task:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        due_date = data.get("dueDate")
         return cls(
             task_id=data.get("taskID", ""),
             title=data.get("title", ""),
             description=data.get("description", ""),
             priority=data.get("priority", "normal"),
             status=data.get("status", "pending"),
-            due_date=datetime.fromisoformat(data.get("dueDate")) if data.get("dueDate") else datetime.now(),
+            due_date=_parse_iso(due_date) if due_date else datetime.now(),
         )
 
 
 class Schedule:
     """Represents a scheduled activity for a member of the care staff."""
 
+    __slots__ = (
+        "carestaff_id",
+        "task",
+        "date",
+        "schedule_id",
+        "purpose",
+        "priority",
+        "location",
+        "date_and_time",
+        "estimated_duration",
+        "recurrence",
+        "staff_list",
+    )
+
     def __init__(
         self,
         carestaff_id: str,
@@ -97,7 +123,8 @@ class Schedule:
         self.carestaff_id = carestaff_id
         self.task = task
         self.date = date  # Backward compatibility for CLI JSON dumps
-        self.schedule_id = schedule_id or f"sch-{carestaff_id}-{hash(task) & 0xffff}"
+        # Deterministic across processes, unlike the salted built-in hash()
+        self.schedule_id = schedule_id or f"sch-{carestaff_id}-{blake2b(task.encode(), digest_size=4).hexdigest()}"
         self.purpose = purpose or task
         self.priority = priority
         self.location = location
@@ -108,7 +135,7 @@ class Schedule:
 
     def _parse_date(self, date_value: str) -> Optional[datetime]:
         try:
-            return datetime.fromisoformat(date_value)
+            return _parse_iso(date_value)
         except (TypeError, ValueError):
             return None
 
@@ -164,6 +191,7 @@ class Schedule:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Schedule":
+        date_and_time = data.get("dateAndTime")
         return cls(
             carestaff_id=data.get("id", ""),
             task=data.get("task", ""),
@@ -172,13 +200,13 @@ class Schedule:
             purpose=data.get("purpose"),
             priority=data.get("priority", "normal"),
             location=data.get("location", ""),
-            date_and_time=datetime.fromisoformat(data.get("dateAndTime")) if data.get("dateAndTime") else None,
+            date_and_time=_parse_iso(date_and_time) if date_and_time else None,
             estimated_duration=int(data.get("estimatedDuration", 0)),
             recurrence=data.get("recurrence", "none"),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Appointment:
     """Captures an appointment request initiated by the patient."""
 
@@ -246,10 +274,11 @@ class Appointment:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Appointment":
+        date_and_time = data.get("dateAndTime")
         return cls(
             appointment_id=data.get("appointmentID", ""),
             patient_id=data.get("id", ""),
-            date_and_time=datetime.fromisoformat(data.get("dateAndTime")) if data.get("dateAndTime") else datetime.now(),
+            date_and_time=_parse_iso(date_and_time) if date_and_time else datetime.now(),
             type=data.get("type", "consultation"),
             status=data.get("status", "requested"),
             notes=data.get("notes", ""),
@@ -1,13 +1,28 @@
 from __future__ import annotations
 
+import hmac
+import os
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from typing import Any, Dict, Optional
 
 import bcrypt
 
+# bcrypt work factor for newly hashed passwords. Override with the
+# CARELOG_BCRYPT_ROUNDS environment variable (e.g. 4 in tests).
+DEFAULT_BCRYPT_ROUNDS = 12
 
-@dataclass
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+def _plain_matches(password: Any, stored: Any) -> bool:
+    """Compare a plain-text password in constant time (no early exit on the first differing byte)."""
+    if not isinstance(password, str) or not isinstance(stored, str):
+        return password == stored
+    return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+
+
+@dataclass(slots=True)
 class User:
     """Represents a system user with basic authentication and profile metadata."""
 
@@ -28,20 +43,32 @@ class User:
         if not self.is_active:
             return False
 
-        if credentials.get("email") == self.email:
-            # Support both bcrypt-hashed passwords and plain-text passwords used in tests
+        if credentials.get("email") != self.email:
+            return False
+
+        # Support both bcrypt-hashed passwords and plain-text passwords used in tests.
+        # Only values that look like a bcrypt hash are handed to bcrypt.
+        password = credentials.get("password")
+        stored = self.password
+        if isinstance(stored, str) and stored.startswith(_BCRYPT_PREFIXES):
             try:
-                if bcrypt.checkpw(credentials.get("password").encode("utf-8"), self.password.encode("utf-8")):
-                    self.is_logged_in = True
-                    self.last_login_at = datetime.now()
-                    return True
+                matched = bcrypt.checkpw(password.encode("utf-8"), stored.encode("utf-8"))
             except (ValueError, TypeError):
-                # Not a valid bcrypt hash; fall back to direct string compare
-                if credentials.get("password") == self.password:
-                    self.is_logged_in = True
-                    self.last_login_at = datetime.now()
-                    return True
-        return False
+                # Malformed hash; fall back to direct string compare
+                matched = _plain_matches(password, stored)
+        else:
+            matched = _plain_matches(password, stored)
+
+        if matched:
+            self.is_logged_in = True
+            self.last_login_at = datetime.now()
+        return matched
+
+    @staticmethod
+    def hash_password(password: str) -> str:
+        """Return a bcrypt hash of `password` using a fresh per-call salt."""
+        rounds = int(os.environ.get("CARELOG_BCRYPT_ROUNDS", DEFAULT_BCRYPT_ROUNDS))
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
 
     def logout(self) -> None:
         """Record a logout event when the user is currently signed in."""
@@ -50,13 +77,17 @@ class User:
             self.last_logout_at = datetime.now()
 
     def update_profile(self, updates: Dict[str, Any]) -> bool:
-        """Update mutable profile fields from the provided mapping."""
+        """Update mutable profile fields from the provided mapping.
+
+        Returns True only when at least one field actually changed; unchanged
+        values are not written back to the DataStore.
+        """
         from app.data.datastore import DataStore
         allowed_fields = {"name", "email", "role"}
         updated = False
 
         for key, value in updates.items():
-            if key in allowed_fields:
+            if key in allowed_fields and getattr(self, key) != value:
                 setattr(self, key, value)
                 updated = True
         
@@ -86,14 +117,21 @@ class User:
             "email": self.email,
             "password": self.password,
             "role": self.role,
-            "createdAt": self.created_at.isoformat(),
+            # Whole epoch seconds; cheaper to write and parse than an ISO string.
+            "createdAt": int(self.created_at.timestamp()),
             "isActive": self.is_active,
         }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "User":
         created = data.get("createdAt")
-        created_dt = datetime.fromisoformat(created) if isinstance(created, str) else datetime.now()
+        if isinstance(created, (int, float)):
+            created_dt = datetime.fromtimestamp(created)
+        elif isinstance(created, str):
+            # Records written before createdAt switched to epoch seconds
+            created_dt = datetime.fromisoformat(created)
+        else:
+            created_dt = datetime.now()
         return cls(
             user_id=data.get("id", ""),
             name=data.get("name", ""),
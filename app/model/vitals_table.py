@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, List
+
+try:
+    import numpy as np
+except ImportError:  # optional; only needed once a table is built
+    np = None
+
+from app.model.medical import VitalSigns
+
+# Bit flags set by VitalSignsTable.detect_anomalies, one per VitalSigns alert.
+HIGH_TEMPERATURE = 1
+LOW_OXYGEN_SATURATION = 2
+ABNORMAL_HEART_RATE = 4
+
+# Vital signs are low-precision by nature: temperature/SpO2 are read to 0.1
+# and every rate or pressure fits comfortably below 300, so the columns use
+# narrow dtypes to halve memory for large archives.
+FLOAT_DTYPE = "float32"
+RATE_DTYPE = "int16"
+
+
+@dataclass
+class VitalSignsTable:
+    """Read-only, column-oriented view over many VitalSigns readings for
+    cohort analytics.
+
+    Each vital sign is held in its own contiguous array so dashboard code can
+    run threshold checks and aggregates over a whole ward at once. The table
+    keeps only what the analytics need, at reduced precision, so it cannot be
+    turned back into records; VitalSigns stays the source of truth for
+    editing and persistence. Requires numpy.
+    """
+
+    index: List[str]
+    created_by: List[str]
+    temperature: np.ndarray
+    heart_rate: np.ndarray
+    blood_pressure_systolic: np.ndarray
+    blood_pressure_diastolic: np.ndarray
+    respiratory_rate: np.ndarray
+    oxygen_saturation: np.ndarray
+    measured_at: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @classmethod
+    def from_records(cls, records: Iterable[VitalSigns]) -> "VitalSignsTable":
+        if np is None:
+            raise ImportError("VitalSignsTable requires numpy")
+        records = list(records)
+        n = len(records)
+
+        def column(attr: str, dtype) -> np.ndarray:
+            return np.fromiter((getattr(r, attr) for r in records), dtype=dtype, count=n)
+
+        return cls(
+            index=[r.record_id for r in records],
+            created_by=[r.created_by for r in records],
+            temperature=column("temperature", FLOAT_DTYPE),
+            heart_rate=column("heart_rate", RATE_DTYPE),
+            blood_pressure_systolic=column("blood_pressure_systolic", RATE_DTYPE),
+            blood_pressure_diastolic=column("blood_pressure_diastolic", RATE_DTYPE),
+            respiratory_rate=column("respiratory_rate", RATE_DTYPE),
+            oxygen_saturation=column("oxygen_saturation", FLOAT_DTYPE),
+            measured_at=np.array([r.measured_at for r in records], dtype="datetime64[us]"),
+        )
+
+    def detect_anomalies(self) -> np.ndarray:
+        """Return a uint8 bitmask per reading using the VitalSigns thresholds."""
+        flags = np.zeros(len(self), dtype=np.uint8)
+        flags[self.temperature > VitalSigns.TEMPERATURE_HIGH] |= HIGH_TEMPERATURE
+        flags[self.oxygen_saturation < VitalSigns.OXYGEN_SATURATION_LOW] |= LOW_OXYGEN_SATURATION
+        abnormal_hr = (self.heart_rate > VitalSigns.HEART_RATE_HIGH) | (self.heart_rate < VitalSigns.HEART_RATE_LOW)
+        flags[abnormal_hr] |= ABNORMAL_HEART_RATE
+        return flags
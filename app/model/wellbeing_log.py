@@ -1,16 +1,48 @@
 import os
+import struct
 from datetime import datetime
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.primitives import padding
-from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from app.model.patient import GCM_NONCE_SIZE, decode_gcm_token, decrypt_legacy_cbc, encode_gcm_token
+
+# Logs written since the packed layout carry one "payload" token whose
+# plaintext is pain level (1 byte), the UTF-8 lengths of mood and appetite,
+# then mood, appetite and notes back to back. Older logs hold one token per
+# field and are still read through the per-field path.
+_PACKED_HEADER = struct.Struct("<BII")
+_PACKED_FIELDS = ("pain_level", "mood", "appetite", "notes")
+
+
+def _pack(pain_level: int, mood: str, appetite: str, notes: str) -> bytes:
+    mood_b, appetite_b = mood.encode(), appetite.encode()
+    try:
+        header = _PACKED_HEADER.pack(int(pain_level), len(mood_b), len(appetite_b))
+    except struct.error:
+        raise ValueError("pain_level must be between 0 and 255.") from None
+    return header + mood_b + appetite_b + notes.encode()
+
+
+def _unpack(data: bytes) -> dict:
+    pain_level, mood_len, appetite_len = _PACKED_HEADER.unpack_from(data)
+    start = _PACKED_HEADER.size
+    mood_end = start + mood_len
+    appetite_end = mood_end + appetite_len
+    return {
+        "pain_level": pain_level,
+        "mood": data[start:mood_end].decode(),
+        "appetite": data[mood_end:appetite_end].decode(),
+        "notes": data[appetite_end:].decode(),
+    }
 
 class WellbeingLog:
     def __init__(self, id: str, patient_id: str, timestamp: datetime,
                  pain_level: int, mood: str, appetite: str, notes: str,
-                 key: bytes = None, iv: bytes = None, encrypted: bool = False):
+                 key: bytes = None, encrypted: bool = False, payload: str = None):
         """
         Initialize a new WellbeingLog instance.
-        Validates required fields and encrypts PHI if needed.
+        Validates required fields and encrypts PHI if needed. A stored packed
+        log passes its token as payload (with encrypted=True) instead of the
+        four per-field tokens.
         """
         # Validate required fields
         if not id:
@@ -19,32 +51,36 @@ class WellbeingLog:
             raise ValueError("patient_id is required.")
         if not timestamp:
             raise ValueError("timestamp is required.")
-        if pain_level is None or pain_level == "":
-            raise ValueError("pain_level is required.")
-        if mood is None or mood == "":
-            raise ValueError("mood is required.")
-        if appetite is None or appetite == "":
-            raise ValueError("appetite is required.")
-        if notes is None or notes == "":
-            raise ValueError("notes is required.")
+        if not (encrypted and payload):
+            for field, value in (("pain_level", pain_level), ("mood", mood),
+                                 ("appetite", appetite), ("notes", notes)):
+                if value is None or value == "":
+                    raise ValueError(f"{field} is required.")
 
         self.id = id
         self.patient_id = patient_id
         self.timestamp = timestamp
         self.key = key or self.generate_key()
-        self.iv = iv or os.urandom(16)
-        if encrypted:
-            # Fields are already encrypted hex strings
+        # Decrypted field memo: field -> (key, token, plaintext); see _decrypted()
+        self._plain = {}
+        if encrypted and payload:
+            self.payload = payload
+            self.pain_level = self.mood = self.appetite = self.notes = None
+        elif encrypted:
+            # Legacy log: one encrypted token per field
+            self.payload = None
             self.pain_level = pain_level
             self.mood = mood
             self.appetite = appetite
             self.notes = notes
         else:
-            # Encrypt fields for new log entry
-            self.pain_level = self.encrypt_field(str(pain_level))
-            self.mood = self.encrypt_field(mood)
-            self.appetite = self.encrypt_field(appetite)
-            self.notes = self.encrypt_field(notes)
+            # New log entry: all PHI fields in one AES-GCM call
+            self.payload = self.encrypt_bytes(_pack(pain_level, mood, appetite, notes))
+            self.pain_level = self.mood = self.appetite = self.notes = None
+            self._plain["payload"] = (self.key, self.payload, {
+                "pain_level": int(pain_level), "mood": mood,
+                "appetite": appetite, "notes": notes,
+            })
 
     def generate_key(self) -> bytes:
         """
@@ -52,40 +88,63 @@ class WellbeingLog:
         """
         return os.urandom(32)  # AES-256
 
+    def encrypt_bytes(self, data: bytes) -> str:
+        """
+        Encrypt raw bytes using AES-256-GCM.
+        Each call uses a fresh 96-bit nonce, stored in front of the ciphertext.
+        """
+        nonce = os.urandom(GCM_NONCE_SIZE)
+        return encode_gcm_token(nonce + AESGCM(self.key).encrypt(nonce, data, None))
+
     def encrypt_field(self, value: str) -> str:
         """
-        Encrypt a field using AES-256 CBC mode.
-        Stores IV with encrypted data for later decryption.
+        Encrypt a text field using AES-256-GCM.
         """
-        backend = default_backend()
-        cipher = Cipher(algorithms.AES(self.key), modes.CBC(self.iv), backend=backend)
-        encryptor = cipher.encryptor()
-        padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(value.encode()) + padder.finalize()
-        encrypted = encryptor.update(padded_data) + encryptor.finalize()
-        return (self.iv + encrypted).hex()
+        return self.encrypt_bytes(value.encode())
+
+    def decrypt_bytes(self, token: str) -> bytes:
+        """
+        Decrypt a token written by encrypt_bytes (AES-256-GCM), or a legacy
+        AES-256 CBC token that carries its IV in the first 16 bytes.
+        """
+        data = decode_gcm_token(token)
+        if data is not None:
+            return AESGCM(self.key).decrypt(data[:GCM_NONCE_SIZE], data[GCM_NONCE_SIZE:], None)
+        return decrypt_legacy_cbc(self.key, token)
 
     def decrypt_field(self, token: str) -> str:
         """
-        Decrypt a field using AES-256 CBC mode.
-        Extracts IV from the start of the encrypted data.
+        Decrypt a text field token.
         """
-        backend = default_backend()
-        data = bytes.fromhex(token)
-        iv = data[:16]
-        encrypted = data[16:]
-        cipher = Cipher(algorithms.AES(self.key), modes.CBC(iv), backend=backend)
-        decryptor = cipher.decryptor()
-        decrypted_padded = decryptor.update(encrypted) + decryptor.finalize()
-        unpadder = padding.PKCS7(128).unpadder()
-        decrypted = unpadder.update(decrypted_padded) + unpadder.finalize()
-        return decrypted.decode()
+        return self.decrypt_bytes(token).decode()
+
+    def _decrypted(self, field: str):
+        """
+        Decrypt the named field at most once per (key, ciphertext).
+        Packed logs decrypt and split the whole payload on first access.
+        Assigning a new ciphertext or key makes the next access decrypt again.
+        """
+        if self.payload is not None:
+            cached = self._plain.get("payload")
+            if cached is None or cached[0] != self.key or cached[1] != self.payload:
+                cached = (self.key, self.payload, _unpack(self.decrypt_bytes(self.payload)))
+                self._plain["payload"] = cached
+            return cached[2][field]
+        token = getattr(self, field)
+        cached = self._plain.get(field)
+        if cached is not None and cached[0] == self.key and cached[1] == token:
+            return cached[2]
+        value = self.decrypt_field(token)
+        self._plain[field] = (self.key, token, value)
+        return value
 
     def get_decrypted_pain_level(self) -> int:
         """
         Decrypt and return pain level as integer.
         """
-        decrypted = self.decrypt_field(self.pain_level)
+        decrypted = self._decrypted("pain_level")
+        if isinstance(decrypted, int):
+            return decrypted
         if not decrypted.isdigit():
             raise ValueError("Decrypted pain level is not a valid integer.")
         return int(decrypted)
@@ -94,61 +153,65 @@ class WellbeingLog:
         """
         Decrypt and return mood.
         """
-        return self.decrypt_field(self.mood)
+        return self._decrypted("mood")
 
     def get_decrypted_appetite(self) -> str:
         """
         Decrypt and return appetite.
         """
-        return self.decrypt_field(self.appetite)
+        return self._decrypted("appetite")
 
     def get_decrypted_notes(self) -> str:
         """
         Decrypt and return notes.
         """
-        return self.decrypt_field(self.notes)
+        return self._decrypted("notes")
 
     def to_dict(self):
         """
         Convert WellbeingLog instance to dictionary representation.
-        Saves key and iv as hex strings for storage.
+        Saves the key as a hex string for storage; packed logs store a single
+        payload token, legacy logs one token per field.
         """
-        return {
+        data = {
             "id": self.id,
             "patient_id": self.patient_id,
             "timestamp": str(self.timestamp),
             "key": self.key.hex(),
-            "iv": self.iv.hex(),
-            "pain_level": self.pain_level,
-            "mood": self.mood,
-            "appetite": self.appetite,
-            "notes": self.notes
         }
+        if self.payload is not None:
+            data["payload"] = self.payload
+        else:
+            data.update(pain_level=self.pain_level, mood=self.mood,
+                        appetite=self.appetite, notes=self.notes)
+        return data
 
     @classmethod
     def from_dict(cls, data: dict):
         """
         Create WellbeingLog instance from dictionary representation.
-        Loads key and iv from hex strings.
-        Validates required fields.
+        Loads the key from its hex string.
+        Validates required fields. A legacy "iv" entry is ignored: CBC tokens
+        embed their IV as well.
         """
-        required = ["id", "patient_id", "timestamp", "pain_level", "mood", "appetite", "notes", "key", "iv"]
+        required = ["id", "patient_id", "timestamp", "key"]
+        if not data.get("payload"):
+            required += _PACKED_FIELDS
         for field in required:
             if field not in data or not data[field]:
                 raise ValueError(f"Missing required field: {field}")
         key = bytes.fromhex(data["key"])
-        iv = bytes.fromhex(data["iv"])
         return cls(
             id=data["id"],
             patient_id=data["patient_id"],
             timestamp=data["timestamp"],
-            pain_level=data["pain_level"],
-            mood=data["mood"],
-            appetite=data["appetite"],
-            notes=data["notes"],
+            pain_level=data.get("pain_level"),
+            mood=data.get("mood"),
+            appetite=data.get("appetite"),
+            notes=data.get("notes"),
             key=key,
-            iv=iv,
-            encrypted=True
+            encrypted=True,
+            payload=data.get("payload"),
         )
 
     def __repr__(self):
@@ -165,12 +228,21 @@ class WellbeingLog:
         Compare two WellbeingLog objects for equality.
         Checks all attributes including encrypted fields.
         """
+        if other is self:
+            return True
         if not isinstance(other, WellbeingLog):
             return NotImplemented
         return (self.id == other.id and
                 self.patient_id == other.patient_id and
                 self.timestamp == other.timestamp and
+                self.payload == other.payload and
                 self.pain_level == other.pain_level and
                 self.mood == other.mood and
                 self.appetite == other.appetite and
                 self.notes == other.notes)
+
+    def __hash__(self):
+        """
+        Hash on the id; equal logs share an id, so this agrees with __eq__.
+        """
+        return hash(self.id)
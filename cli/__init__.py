@@ -0,0 +1 @@
+"""Command-line front ends for CareLog (patient, nurse, doctor and admin)."""
@@ -0,0 +1,48 @@
+"""Shared setup and helpers for the CareLog CLIs."""
+
+import re
+import sys
+from pathlib import Path
+
+# Add the repo root to the path for imports (needed when a CLI is run as a
+# script); skip it if already present, since every duplicate entry adds stat
+# calls to each later import lookup
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from colorama import Fore, Style, init
+from colorama.ansitowin32 import StreamWrapper
+
+# init() wraps whatever sys.stdout currently is, so it runs only if it has
+# not been wrapped yet; a second call would nest another filter that
+# re-scans every write. The wrapper stays even when output is piped: it is
+# what strips the ANSI codes there.
+if not isinstance(sys.stdout, StreamWrapper):
+    init(autoreset=True)
+
+# Report dates as prompted (YYYY-MM-DD); checked before fromisoformat so a
+# typo is rejected without raising, and times or other ISO forms are refused.
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+SEVERITY_COLORS = {"high": Fore.RED, "medium": Fore.YELLOW, "low": Fore.WHITE}
+
+# Loop prompts, built once rather than on every user action
+CHOICE_PROMPT = Fore.WHITE + "\nEnter your choice: "
+CONTINUE_PROMPT = Fore.WHITE + "\nPress Enter to continue..."
+
+
+def select(items, choice):
+    """Return the item for a 1-based menu number, or None if out of range or not a number."""
+    index = int(choice) - 1 if choice.isdecimal() else -1
+    return items[index] if 0 <= index < len(items) else None
+
+
+def print_lines(lines):
+    """Print a listing with one write instead of one print() per line.
+
+    Each line still ends with a colour reset, as it would under colorama's
+    autoreset if printed on its own.
+    """
+    if lines:
+        print((Style.RESET_ALL + "\n").join(lines))
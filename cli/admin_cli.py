@@ -1,6 +1,20 @@
 from colorama import Fore
 from app.model.admin import Admin
 from app.model.patient import Patient
+from cli._common import CONTINUE_PROMPT
+
+# Built once; printed with a single write on every pass of the main loop.
+_MAIN_MENU = (
+    "[ADMIN'S MAIN MENU]\n"
+    "1. Add patient(s).\n"
+    "2. Update patient's information.\n"
+    "3. Remove patient(s).\n"
+    "4. Update carestaff's information.\n"
+    "5. Remove carestaff(s).\n"
+    "6. Get patient's information or record.\n"
+    "7. Get the number of patients for all the carestaffs has.\n"
+    "8. Log out."
+)
 
 class AdminCLI:
     
@@ -67,22 +81,22 @@ class AdminCLI:
         print(f"Login successful! Welcome back {self.current_admin.name}! ")
         admin_on = True
         while admin_on:
-            print("[ADMIN'S MAIN MENU]")
-            print("1. Add patient(s).")
-            print("2. Update patient's information.")
-            print("3. Remove patient(s).")
-            print("4. Update carestaff's information.")
-            print("5. Remove carestaff(s).")
-            print("6. Get patient's information or record.")
-            print("7. Get the number of patients for all the carestaffs has.")
-            print("8. Log out.")
-
-            choice = int(input("Enter your choice: "))
-
-            if choice == 1:
-                number_of_patients = int(input("Enter the number of patients that you want to add: "))
-
-                new_patients_list = []
+            print(_MAIN_MENU)
+
+            # Compared as strings: a typo falls through to the "invalid"
+            # branch instead of raising ValueError out of int().
+            choice = input("Enter your choice: ").strip()
+
+            if choice == "1":
+                raw = input("Enter the number of patients that you want to add: ").strip()
+                if not raw.isdigit():
+                    print("Please enter a number.")
+                    continue
+                number_of_patients = int(raw)
+
+                # Filled by index and handed over in one call, which
+                # add_new_patients persists with a single file write.
+                new_patients_list = [None] * number_of_patients
                 for i in range(number_of_patients):
                     print(f"You are entering details for patient number {i + 1}.")
                     id = str(input("Enter the patient ID assigned to the new patient: "))
@@ -91,24 +105,29 @@ class AdminCLI:
                     phone = str(input("Enter patient's phone: "))
                     print("The default password hash for the patient is [abcd1234] - patient can change it themselves afterwards.")
                     # Create new patient, add it into list of patients
-                    new_patients_list.append(
-                        Patient(name, id, phone, email).to_dict()
+                    new_patients_list[i] = Patient(
+                        id=id, name=name, email=email, phone=phone, password="abcd1234"
                     )
                 self.current_admin.add_new_patients(new_patients_list)
             
-            elif choice == 2:
+            elif choice == "2":
                 id = str(input("Enter the patient ID of the patient's information that you want to change: "))
                 print("Which information do you want to change? ")
                 print("1. Patient's name.")
                 print("2. Patient's email.")
                 print("3. Patient's phone.")
-                choice = int(input("Enter your choice: "))
+                field = input("Enter your choice: ").strip()
                 information = str(input("What do you want to change it to: "))
 
-                self.current_admin.update_patients_information(id, choice, information)
+                # Unknown numbers are rejected by update_patients_information
+                self.current_admin.update_patients_information(id, int(field) if field.isdigit() else 0, information)
 
-            elif choice == 3:
-                number_of_patients = int(input("Enter the number of patients that you want to remove: "))
+            elif choice == "3":
+                raw = input("Enter the number of patients that you want to remove: ").strip()
+                if not raw.isdigit():
+                    print("Please enter a number.")
+                    continue
+                number_of_patients = int(raw)
 
                 id_list = []
                 print("Please enter the patient ID of the patient that you want to delete - one by one.")
@@ -118,7 +137,7 @@ class AdminCLI:
                 
                 self.current_admin.remove_patients(id_list)
 
-            elif choice == 4:
+            elif choice == "4":
                 id = str(input("Enter the carestaff ID of the carestaff's information that you want to change: "))
                 department = None
                 specialization = None
@@ -130,18 +149,14 @@ class AdminCLI:
                 if not self.current_admin.update_carestaffs_information(id, department, specialization):
                     print("Update failed. Please try again.")
 
-            elif choice == 5:
+            elif choice == "5":
                 id = str(input("Enter the id of the carestaff that you want to remove: "))
                 self.current_admin.remove_carestaffs([id])
-            elif choice == 6:
+            elif choice == "6":
                 id = str(input("Enter the patients's patient ID: "))
-                print("What do you want to get? ")
-                print("1. Patient's information.")
-                print("2. Patient's record.")
-                choice = int(input("Enter your choice: "))
-                self.current_admin.search_patient_information(id, choice)
+                self.current_admin.search_patient_information(id)
 
-            elif choice == 7:
+            elif choice == "7":
                 id = str(input("Enter the carestaff ID: "))
                 num = self.current_admin.number_of_patients(id)
                 if num is not None:
@@ -149,10 +164,12 @@ class AdminCLI:
                 else:
                     print("Carestaff not found. Please try again.")
 
-            elif choice == 8:
+            elif choice == "8":
                 print("You are logging out...")
                 admin_on = False
-            input(Fore.WHITE + "\nPress Enter to continue...")
+            else:
+                print("Invalid choice, try again.")
+            input(CONTINUE_PROMPT)
 
 if __name__ == "__main__":
     admin_cli = AdminCLI()
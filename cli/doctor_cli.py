@@ -1,20 +1,45 @@
 #!/usr/bin/env python3
 """Doctor CLI - Command-line interface for doctor functionality in CareLog system."""
 
-import sys
 from datetime import datetime
-from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from colorama import Fore, init
+if not __package__:
+    # Run as a script (python cli/doctor_cli.py): only cli/ is on sys.path.
+    # Loading the shared module by file name puts the repo root there too.
+    import _common  # noqa: F401
+
+from cli._common import (
+    CHOICE_PROMPT,
+    CONTINUE_PROMPT,
+    DATE_RE,
+    SEVERITY_COLORS,
+    print_lines,
+    select,
+)
+from colorama import Fore, Style
 
 from app.model.carestaff import Doctor
 from app.data.datastore import DataStore
 
-# Initialize colorama
-init(autoreset=True)
+
+# Built once; printed with a single write on every pass of the main loop.
+_MENU = (
+    Fore.CYAN + "\n=== Doctor Menu ===" + Style.RESET_ALL + "\n"
+    "1. Login/Register\n"
+    "2. View My Patients\n"
+    "3. View Medical Records\n"
+    "4. Update Medical Details\n"
+    "5. Prescribe Medication\n"
+    "6. Approve Treatment Plan\n"
+    "7. Escalate to Specialist\n"
+    "8. Manage Appointments\n"
+    "9. View My Schedule\n"
+    "10. View Alerts\n"
+    "11. Generate Report\n"
+    "12. Logout\n"
+    "0. Exit\n"
+    + Fore.CYAN + "=" * 30
+)
 
 
 class DoctorCLI:
@@ -23,6 +48,22 @@ class DoctorCLI:
     def __init__(self):
         self.current_doctor: Doctor | None = None
         self.running = True
+        # Menu choice -> handler, looked up once per pass of run()
+        self._menu = {
+            "0": self._exit,
+            "1": self.login,
+            "2": self.view_patients,
+            "3": self.view_medical_records,
+            "4": self.update_medical_details,
+            "5": self.prescribe_medication,
+            "6": self.approve_treatment_plan,
+            "7": self.escalate_to_specialist,
+            "8": self.manage_appointments,
+            "9": self.view_schedule,
+            "10": self.view_alerts,
+            "11": self.generate_report,
+            "12": self.logout,
+        }
 
     def display_banner(self):
         """Display welcome banner."""
@@ -32,21 +73,7 @@ class DoctorCLI:
 
     def display_menu(self):
         """Display main menu options."""
-        print(Fore.CYAN + "\n=== Doctor Menu ===")
-        print("1. Login/Register")
-        print("2. View My Patients")
-        print("3. View Medical Records")
-        print("4. Update Medical Details")
-        print("5. Prescribe Medication")
-        print("6. Approve Treatment Plan")
-        print("7. Escalate to Specialist")
-        print("8. Manage Appointments")
-        print("9. View My Schedule")
-        print("10. View Alerts")
-        print("11. Generate Report")
-        print("12. Logout")
-        print("0. Exit")
-        print(Fore.CYAN + "=" * 30)
+        print(_MENU)
 
     def register(self,id:str):
         """Register a new doctor."""
@@ -108,11 +135,13 @@ class DoctorCLI:
             print(Fore.YELLOW + "No patients found in system.")
             return
 
+        lines = []
         for i, patient in enumerate(patients, 1):
             risk_marker = Fore.RED + " [HIGH RISK]" if patient.get("high_risk") else ""
-            print(f"{i}. {Fore.WHITE}ID: {patient.get('id')} | "
-                  f"Name: {patient.get('name')} | "
-                  f"Disease: {patient.get('disease', 'N/A')}{risk_marker}")
+            lines.append(f"{i}. {Fore.WHITE}ID: {patient.get('id')} | "
+                         f"Name: {patient.get('name')} | "
+                         f"Disease: {patient.get('disease', 'N/A')}{risk_marker}")
+        print_lines(lines)
 
     def view_medical_records(self):
         """View medical records for a specific patient."""
@@ -155,7 +184,7 @@ class DoctorCLI:
         if description:
             medical_info["description"] = description
         if medications:
-            medical_info["medications"] = [m.strip() for m in medications.split(",")]
+            medical_info["medications"] = [m for m in map(str.strip, medications.split(",")) if m]
         if department:
             medical_info["department"] = department
 
@@ -280,14 +309,16 @@ class DoctorCLI:
             print(Fore.YELLOW + "No scheduled activities.")
             return
 
+        lines = []
         for i, schedule in enumerate(schedules, 1):
-            print(f"{i}. {Fore.WHITE}Task: {schedule.task}")
-            print(f"   Date: {schedule.date}")
-            print(f"   Purpose: {schedule.purpose}")
-            print(f"   Priority: {schedule.priority}")
+            lines.append(f"{i}. {Fore.WHITE}Task: {schedule.task}")
+            lines.append(f"   Date: {schedule.date}")
+            lines.append(f"   Purpose: {schedule.purpose}")
+            lines.append(f"   Priority: {schedule.priority}")
             if schedule.location:
-                print(f"   Location: {schedule.location}")
-            print()
+                lines.append(f"   Location: {schedule.location}")
+            lines.append("")
+        print_lines(lines)
 
     def view_alerts(self):
         """View all alerts."""
@@ -301,23 +332,20 @@ class DoctorCLI:
             print(Fore.YELLOW + "No active alerts.")
             return
 
+        lines = []
         for i, alert in enumerate(alerts, 1):
-            severity_color = {
-                "high": Fore.RED,
-                "medium": Fore.YELLOW,
-                "low": Fore.WHITE,
-            }.get(alert.severity, Fore.WHITE)
-
-            print(f"{i}. {severity_color}[{alert.severity.upper()}] {alert.message}")
-            print(f"   Type: {alert.type} | Priority: {alert.calculate_priority()}")
-            print(f"   Acknowledged: {'Yes' if alert.acknowledged_at else 'No'}")
-            print(f"   Resolved: {'Yes' if alert.resolved_at else 'No'}")
-            print()
+            severity_color = SEVERITY_COLORS.get(alert.severity, Fore.WHITE)
+            lines.append(f"{i}. {severity_color}[{alert.severity.upper()}] {alert.message}")
+            lines.append(f"   Type: {alert.type} | Priority: {alert.calculate_priority()}")
+            lines.append(f"   Acknowledged: {'Yes' if alert.acknowledged_at else 'No'}")
+            lines.append(f"   Resolved: {'Yes' if alert.resolved_at else 'No'}")
+            lines.append("")
+        print_lines(lines)
 
         # Offer to handle alerts
         choice = input("\nHandle an alert? (Enter alert number or 0 to skip): ").strip()
-        if choice.isdigit() and 0 < int(choice) <= len(alerts):
-            alert = alerts[int(choice) - 1]
+        alert = select(alerts, choice)
+        if alert is not None:
             action = input("Action (acknowledge/resolve): ").strip().lower()
             if self.current_doctor.handle_alert(alert.alert_id, action):
                 print(Fore.GREEN + f"✓ Alert {action}d successfully")
@@ -334,10 +362,13 @@ class DoctorCLI:
         start_date_str = input("Start date (YYYY-MM-DD): ").strip()
         end_date_str = input("End date (YYYY-MM-DD): ").strip()
 
+        if not (DATE_RE.fullmatch(start_date_str) and DATE_RE.fullmatch(end_date_str)):
+            print(Fore.RED + "✗ Invalid date format. Use YYYY-MM-DD.")
+            return
         try:
             start_date = datetime.fromisoformat(start_date_str)
             end_date = datetime.fromisoformat(end_date_str)
-        except ValueError:
+        except ValueError:  # right shape, impossible date such as 2025-02-30
             print(Fore.RED + "✗ Invalid date format. Use YYYY-MM-DD.")
             return
 
@@ -377,49 +408,30 @@ class DoctorCLI:
             return False
         return True
 
+    def _exit(self):
+        """Leave the main loop."""
+        self.running = False
+        print(Fore.CYAN + "\nThank you for using CareLog Doctor System!")
+
     def run(self):
         """Main application loop."""
         self.display_banner()
 
         while self.running:
             self.display_menu()
-            choice = input(Fore.WHITE + "\nEnter your choice: ").strip()
+            choice = input(CHOICE_PROMPT).strip()
 
             try:
-                if choice == "0":
-                    self.running = False
-                    print(Fore.CYAN + "\nThank you for using CareLog Doctor System!")
-                elif choice == "1":
-                    self.login()
-                elif choice == "2":
-                    self.view_patients()
-                elif choice == "3":
-                    self.view_medical_records()
-                elif choice == "4":
-                    self.update_medical_details()
-                elif choice == "5":
-                    self.prescribe_medication()
-                elif choice == "6":
-                    self.approve_treatment_plan()
-                elif choice == "7":
-                    self.escalate_to_specialist()
-                elif choice == "8":
-                    self.manage_appointments()
-                elif choice == "9":
-                    self.view_schedule()
-                elif choice == "10":
-                    self.view_alerts()
-                elif choice == "11":
-                    self.generate_report()
-                elif choice == "12":
-                    self.logout()
+                handler = self._menu.get(choice)
+                if handler is not None:
+                    handler()
                 else:
                     print(Fore.RED + "✗ Invalid choice. Please try again.")
             except KeyboardInterrupt:
                 print(Fore.YELLOW + "\n\nOperation cancelled by user.")
             except Exception as e:
                 print(Fore.RED + f"✗ Error: {str(e)}")
-            input(Fore.WHITE + "\nPress Enter to continue...")
+            input(CONTINUE_PROMPT)
 
         print(Fore.CYAN + "Exiting...\n")
 
@@ -1,20 +1,17 @@
 #!/usr/bin/env python3
 """Top-level CLI to choose Patient, Nurse, Doctor, or Admin interfaces."""
 
-from pathlib import Path
-import sys
+if not __package__:
+    # Run as a script (python cli/main_cli.py): only cli/ is on sys.path.
+    # Loading the shared module by file name puts the repo root there too,
+    # and initializes colorama.
+    import _common  # noqa: F401
 
-# Ensure repo root is on path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import cli._common  # noqa: F401  (sys.path and colorama setup)
+from colorama import Fore, Style
 
-from colorama import Fore, init
-
-from cli.doctor_cli import DoctorCLI
-from cli.nurse_cli import NurseCLI
-from cli.admin_cli import AdminCLI
-from cli.patient_cli import PatientCli
-
-init(autoreset=True)
+# The role CLIs are imported inside main() when chosen, so startup only pays
+# for the models, crypto and argon2/bcrypt imports of the role being used.
 
 
 def display_banner():
@@ -23,13 +20,18 @@ def display_banner():
     print("=" * 60 + "\n")
 
 
+_MENU = (
+    Fore.CYAN + "\nSelect role to continue:" + Style.RESET_ALL + "\n"
+    "1. Patient\n"
+    "2. Nurse\n"
+    "3. Doctor\n"
+    "4. Admin\n"
+    "0. Exit"
+)
+
+
 def display_menu():
-    print(Fore.CYAN + "\nSelect role to continue:")
-    print("1. Patient")
-    print("2. Nurse")
-    print("3. Doctor")
-    print("4. Admin")
-    print("0. Exit")
+    print(_MENU)
 
 
 def main():
@@ -43,14 +45,18 @@ def main():
         elif choice == "1":
             # Delegate to existing patient flow (main.py)
             try:
+                from cli.patient_cli import PatientCli
                 PatientCli().run()
             except Exception as e:
                 print(Fore.RED + f"Error launching patient UI: {e}")
         elif choice == "2":
+            from cli.nurse_cli import NurseCLI
             NurseCLI().run()
         elif choice == "3":
+            from cli.doctor_cli import DoctorCLI
             DoctorCLI().run()
         elif choice == "4":
+            from cli.admin_cli import AdminCLI
             AdminCLI().run()
         else:
             print(Fore.YELLOW + "Invalid choice, try again.")
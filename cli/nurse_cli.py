@@ -1,20 +1,61 @@
 #!/usr/bin/env python3
 """Nurse CLI - Command-line interface for nurse functionality in CareLog system."""
 
-import sys
 from datetime import datetime, timedelta
-from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from colorama import Fore, Style, init
+if not __package__:
+    # Run as a script (python cli/nurse_cli.py): only cli/ is on sys.path.
+    # Loading the shared module by file name puts the repo root there too.
+    import _common  # noqa: F401
+
+from cli._common import (
+    CHOICE_PROMPT,
+    CONTINUE_PROMPT,
+    DATE_RE,
+    SEVERITY_COLORS,
+    print_lines,
+    select,
+)
+from colorama import Fore, Style
 
 from app.model.carestaff import Nurse
 from app.data.datastore import DataStore
 
-# Initialize colorama
-init(autoreset=True)
+# Status prefixes shared by the confirmation and error messages
+_OK = Fore.GREEN + "✓ "
+_FAIL = Fore.RED + "✗ "
+
+_PRIORITY_COLORS = {"high": Fore.RED, "normal": Fore.YELLOW, "low": Fore.WHITE}
+_DELIVERY_COLORS = {"pending": Fore.YELLOW, "delivered": Fore.GREEN, "cancelled": Fore.RED}
+_CARE_PLAN_TYPES = {"1": "observation", "2": "nursing", "3": "post-op", "4": "rehabilitation"}
+
+# Vital-sign update prompts as (prompt, update key, converter); blank answers are skipped
+_VITAL_FIELDS = (
+    ("Temperature (°C): ", "temperature", float),
+    ("Heart Rate (bpm): ", "heart_rate", float),
+    ("Blood Pressure (e.g., 120/80): ", "blood_pressure", str),
+    ("Respiratory Rate (/min): ", "respiratory_rate", float),
+    ("Oxygen Saturation (%): ", "oxygen_saturation", float),
+)
+
+# Built once; printed with a single write on every pass of the main loop.
+_MENU = (
+    Fore.CYAN + "\n=== Nurse Menu ===" + Style.RESET_ALL + "\n"
+    "1. Login/Register\n"
+    "2. View My Patients\n"
+    "3. View/Update Vital Signs\n"
+    "4. Administer Medication\n"
+    "5. Manage Food Deliveries\n"
+    "6. Create Food Delivery\n"
+    "7. Coordinate Care\n"
+    "8. View Pending Tasks\n"
+    "9. View My Schedule\n"
+    "10. View Alerts\n"
+    "11. Generate Report\n"
+    "12. Logout\n"
+    "0. Exit\n"
+    + Fore.CYAN + "=" * 30
+)
 
 
 class NurseCLI:
@@ -23,6 +64,22 @@ class NurseCLI:
     def __init__(self):
         self.current_nurse: Nurse | None = None
         self.running = True
+        # Menu choice -> handler, looked up once per pass of run()
+        self._menu = {
+            "0": self._exit,
+            "1": self.login,
+            "2": self.view_patients,
+            "3": self.view_update_vitals,
+            "4": self.administer_medication,
+            "5": self.manage_food_deliveries,
+            "6": self.create_food_delivery,
+            "7": self.coordinate_care,
+            "8": self.view_pending_tasks,
+            "9": self.view_schedule,
+            "10": self.view_alerts,
+            "11": self.generate_report,
+            "12": self.logout,
+        }
 
     def display_banner(self):
         """Display welcome banner."""
@@ -32,21 +89,7 @@ class NurseCLI:
 
     def display_menu(self):
         """Display main menu options."""
-        print(Fore.CYAN + "\n=== Nurse Menu ===")
-        print("1. Login/Register")
-        print("2. View My Patients")
-        print("3. View/Update Vital Signs")
-        print("4. Administer Medication")
-        print("5. Manage Food Deliveries")
-        print("6. Create Food Delivery")
-        print("7. Coordinate Care")
-        print("8. View Pending Tasks")
-        print("9. View My Schedule")
-        print("10. View Alerts")
-        print("11. Generate Report")
-        print("12. Logout")
-        print("0. Exit")
-        print(Fore.CYAN + "=" * 30)
+        print(_MENU)
 
     def register(self,id:str):
         """Register a new nurse."""
@@ -58,7 +101,8 @@ class NurseCLI:
         department = input("Enter Department: ").strip()
         qualifications = input("Enter Qualifications (comma-separated, optional): ").strip()
 
-        qual_list = [q.strip() for q in qualifications.split(",")] if qualifications else []
+        # One pass that also drops empty entries from stray or trailing commas
+        qual_list = [q for q in map(str.strip, qualifications.split(",")) if q]
 
 
         new_nurse = Nurse.register(
@@ -72,10 +116,10 @@ class NurseCLI:
         )
 
         if new_nurse:
-            print(Fore.GREEN + f"✓ Registration successful! Your Nurse ID is {new_nurse.staff_id}")
+            print(f"{_OK}Registration successful! Your Nurse ID is {new_nurse.staff_id}")
             self.current_nurse = new_nurse
         else:
-            print(Fore.RED + "✗ Registration failed. Please try again.")
+            print(f"{_FAIL}Registration failed. Please try again.")
 
     def login(self):
         """Handle nurse login."""
@@ -97,7 +141,7 @@ class NurseCLI:
             if self.current_nurse.qualifications:
                 print(Fore.GREEN + f"  Qualifications: {', '.join(self.current_nurse.qualifications)}")
         else:
-            print(Fore.RED + "✗ Login failed. Please check credentials.")
+            print(f"{_FAIL}Login failed. Please check credentials.")
             self.current_nurse = None
 
     def view_patients(self):
@@ -113,11 +157,13 @@ class NurseCLI:
             print(Fore.YELLOW + "No patients found in system.")
             return
 
+        lines = []
         for i, patient in enumerate(patients, 1):
             risk_marker = Fore.RED + " [HIGH RISK]" if patient.get("high_risk") else ""
-            print(f"{i}. {Fore.WHITE}ID: {patient.get('id')} | "
-                  f"Name: {patient.get('name')} | "
-                  f"Disease: {patient.get('disease', 'N/A')}{risk_marker}")
+            lines.append(f"{i}. {Fore.WHITE}ID: {patient.get('id')} | "
+                         f"Name: {patient.get('name')} | "
+                         f"Disease: {patient.get('disease', 'N/A')}{risk_marker}")
+        print_lines(lines)
 
     def view_update_vitals(self):
         """View or update vital signs for a patient."""
@@ -131,13 +177,15 @@ class NurseCLI:
         vitals = self.current_nurse.get_patient_vitals(patient_id)
         
         if vitals:
-            print(Fore.GREEN + f"\nCurrent Vital Signs for Patient {patient_id}:")
-            print(f"  Temperature: {vitals.get('temperature', 'N/A')}°C")
-            print(f"  Heart Rate: {vitals.get('heartRate', 'N/A')} bpm")
-            print(f"  Blood Pressure: {vitals.get('bloodPressure', 'N/A')}")
-            print(f"  Respiratory Rate: {vitals.get('respiratoryRate', 'N/A')} /min")
-            print(f"  Oxygen Saturation: {vitals.get('oxygenSaturation', 'N/A')}%")
-            print(f"  Last Updated: {vitals.get('measuredAt', 'N/A')}")
+            print_lines([
+                Fore.GREEN + f"\nCurrent Vital Signs for Patient {patient_id}:",
+                f"  Temperature: {vitals.get('temperature', 'N/A')}°C",
+                f"  Heart Rate: {vitals.get('heartRate', 'N/A')} bpm",
+                f"  Blood Pressure: {vitals.get('bloodPressure', 'N/A')}",
+                f"  Respiratory Rate: {vitals.get('respiratoryRate', 'N/A')} /min",
+                f"  Oxygen Saturation: {vitals.get('oxygenSaturation', 'N/A')}%",
+                f"  Last Updated: {vitals.get('measuredAt', 'N/A')}",
+            ])
             
             # Check for anomalies
             anomalies = vitals.get('anomalies', [])
@@ -150,27 +198,19 @@ class NurseCLI:
         update = input("\nUpdate vital signs? (y/n): ").strip().lower()
         if update == 'y':
             print("\nEnter new vital signs (leave blank to skip):")
-            temperature = input("Temperature (°C): ").strip()
-            heart_rate = input("Heart Rate (bpm): ").strip()
-            blood_pressure = input("Blood Pressure (e.g., 120/80): ").strip()
-            respiratory_rate = input("Respiratory Rate (/min): ").strip()
-            oxygen_saturation = input("Oxygen Saturation (%): ").strip()
-
             new_vitals = {}
-            if temperature:
-                new_vitals["temperature"] = float(temperature)
-            if heart_rate:
-                new_vitals["heart_rate"] = float(heart_rate)
-            if blood_pressure:
-                new_vitals["blood_pressure"] = blood_pressure
-            if respiratory_rate:
-                new_vitals["respiratory_rate"] = float(respiratory_rate)
-            if oxygen_saturation:
-                new_vitals["oxygen_saturation"] = float(oxygen_saturation)
+            for prompt, key, cast in _VITAL_FIELDS:
+                # Re-ask a field until it parses, keeping the values already entered
+                while value := input(prompt).strip():
+                    try:
+                        new_vitals[key] = cast(value)
+                        break
+                    except ValueError:
+                        print(f"{_FAIL}Please enter a number (or leave blank to skip)")
 
             if new_vitals:
                 if self.current_nurse.update_vital_signs(patient_id, new_vitals):
-                    print(Fore.GREEN + f"✓ Vital signs updated for patient {patient_id}")
+                    print(f"{_OK}Vital signs updated for patient {patient_id}")
                     
                     # Check for new anomalies
                     updated_vitals = self.current_nurse.vital_signs.get(patient_id)
@@ -181,7 +221,7 @@ class NurseCLI:
                             for anomaly in anomalies:
                                 print(Fore.RED + f"  - {anomaly}")
                 else:
-                    print(Fore.RED + "✗ Failed to update vital signs")
+                    print(f"{_FAIL}Failed to update vital signs")
             else:
                 print(Fore.YELLOW + "No values entered. Update cancelled.")
 
@@ -204,10 +244,10 @@ class NurseCLI:
         }
 
         if self.current_nurse.mark_medication_administered(patient_id, medication):
-            print(Fore.GREEN + f"✓ Medication '{medication_name}' administered to patient {patient_id}")
+            print(f"{_OK}Medication '{medication_name}' administered to patient {patient_id}")
             print(Fore.GREEN + "  Task recorded successfully.")
         else:
-            print(Fore.RED + "✗ Failed to record medication administration")
+            print(f"{_FAIL}Failed to record medication administration")
 
     def manage_food_deliveries(self):
         """Manage existing food deliveries."""
@@ -220,23 +260,19 @@ class NurseCLI:
             print(Fore.YELLOW + "No food deliveries assigned.")
             return
 
-        print("Current Food Deliveries:")
+        lines = ["Current Food Deliveries:"]
         for i, delivery in enumerate(self.current_nurse.food_deliveries, 1):
-            status_color = {
-                "pending": Fore.YELLOW,
-                "delivered": Fore.GREEN,
-                "cancelled": Fore.RED,
-            }.get(delivery.status, Fore.WHITE)
-            
-            print(f"{i}. {status_color}[{delivery.status.upper()}] {delivery.delivery_id}")
-            print(f"   Items: {delivery.food_items}")
-            print(f"   Room: {delivery.room_number}")
-            print(f"   Scheduled: {delivery.scheduled_time}")
-            print()
+            status_color = _DELIVERY_COLORS.get(delivery.status, Fore.WHITE)
+            lines.append(f"{i}. {status_color}[{delivery.status.upper()}] {delivery.delivery_id}")
+            lines.append(f"   Items: {delivery.food_items}")
+            lines.append(f"   Room: {delivery.room_number}")
+            lines.append(f"   Scheduled: {delivery.scheduled_time}")
+            lines.append("")
+        print_lines(lines)
 
         choice = input("Enter delivery number to manage (or 0 to skip): ").strip()
-        if choice.isdigit() and 0 < int(choice) <= len(self.current_nurse.food_deliveries):
-            delivery = self.current_nurse.food_deliveries[int(choice) - 1]
+        delivery = select(self.current_nurse.food_deliveries, choice)
+        if delivery is not None:
             
             print("\nActions:")
             print("1. Mark as Delivered")
@@ -247,36 +283,32 @@ class NurseCLI:
 
             if action == "1":
                 if self.current_nurse.manage_food_deliveries(delivery.delivery_id, "delivered"):
-                    print(Fore.GREEN + f"✓ Delivery {delivery.delivery_id} marked as delivered")
+                    print(f"{_OK}Delivery {delivery.delivery_id} marked as delivered")
             elif action == "2":
                 if self.current_nurse.manage_food_deliveries(delivery.delivery_id, "cancel"):
-                    print(Fore.GREEN + f"✓ Delivery {delivery.delivery_id} cancelled")
+                    print(f"{_OK}Delivery {delivery.delivery_id} cancelled")
             elif action == "3":
                 patient_id = input("Enter Patient ID to verify allergies: ").strip()
-                # Load patient data
-                patients = DataStore.get_collection("patients")
-                patient_data = next((p for p in patients if p.get("id") == patient_id), None)
+                # Indexed lookup; the id index is shared and rebuilt only when the file changes
+                patient_data = DataStore.get_by_id("patients", "id", patient_id)
 
                 if not patient_data:
-                    print(Fore.RED + "✗ Patient not found")
+                    print(f"{_FAIL}Patient not found")
                     return
 
                 # Basic allergy check: compare listed allergies against food items
-                allergies = [a.lower() for a in patient_data.get("allergies", [])]
+                # Normalise once: lowercase, drop blanks and duplicates (keeping order)
+                allergies = tuple(dict.fromkeys(a.lower() for a in patient_data.get("allergies", []) if a))
                 items = [it.strip().lower() for it in delivery.food_items.split(",")] if isinstance(delivery.food_items, str) else [str(delivery.food_items).lower()]
 
-                conflicts = []
-                for allergen in allergies:
-                    for item in items:
-                        if allergen and allergen in item:
-                            conflicts.append((allergen, item))
+                conflicts = [(allergen, item) for allergen in allergies for item in items if allergen in item]
 
                 if conflicts:
-                    print(Fore.RED + "✗ WARNING: Allergy conflict(s) detected!")
+                    print(f"{_FAIL}WARNING: Allergy conflict(s) detected!")
                     for a, itm in conflicts:
                         print(Fore.RED + f"  - Allergen '{a}' found in menu item '{itm}'")
                 else:
-                    print(Fore.GREEN + "✓ No allergy conflicts detected")
+                    print(f"{_OK}No allergy conflicts detected")
 
     def create_food_delivery(self):
         """Create a new food delivery."""
@@ -301,10 +333,10 @@ class NurseCLI:
                 room_num,
                 scheduled_time,
             )
-            print(Fore.GREEN + f"✓ Food delivery created: {delivery.delivery_id}")
+            print(f"{_OK}Food delivery created: {delivery.delivery_id}")
             print(Fore.GREEN + f"  Scheduled for: {scheduled_time.strftime('%Y-%m-%d %H:%M')}")
         except ValueError:
-            print(Fore.RED + "✗ Invalid room number")
+            print(f"{_FAIL}Invalid room number")
 
     def coordinate_care(self):
         """Coordinate care plan for a patient."""
@@ -321,13 +353,7 @@ class NurseCLI:
         print("4. Rehabilitation")
         
         choice = input("Select type (1-4): ").strip()
-        type_map = {
-            "1": "observation",
-            "2": "nursing",
-            "3": "post-op",
-            "4": "rehabilitation",
-        }
-        care_type = type_map.get(choice, "nursing")
+        care_type = _CARE_PLAN_TYPES.get(choice, "nursing")
         
         notes = input("Care plan notes: ").strip()
 
@@ -339,10 +365,10 @@ class NurseCLI:
         }
 
         if self.current_nurse.coordinate_care(patient_id, care_plan):
-            print(Fore.GREEN + f"✓ Care plan coordinated for patient {patient_id}")
+            print(f"{_OK}Care plan coordinated for patient {patient_id}")
             print(Fore.GREEN + f"  Type: {care_type}")
         else:
-            print(Fore.RED + "✗ Failed to coordinate care")
+            print(f"{_FAIL}Failed to coordinate care")
 
     def view_pending_tasks(self):
         """View all pending tasks."""
@@ -356,27 +382,24 @@ class NurseCLI:
             print(Fore.GREEN + "No pending tasks. All caught up!")
             return
 
+        lines = []
         for i, task in enumerate(pending, 1):
-            priority_color = {
-                "high": Fore.RED,
-                "normal": Fore.YELLOW,
-                "low": Fore.WHITE,
-            }.get(task.priority, Fore.WHITE)
-            
-            print(f"{i}. {priority_color}[{task.priority.upper()}] {task.title}")
-            print(f"   Description: {task.description}")
-            print(f"   Status: {task.status}")
-            print(f"   Due: {task.due_date}")
-            print()
+            priority_color = _PRIORITY_COLORS.get(task.priority, Fore.WHITE)
+            lines.append(f"{i}. {priority_color}[{task.priority.upper()}] {task.title}")
+            lines.append(f"   Description: {task.description}")
+            lines.append(f"   Status: {task.status}")
+            lines.append(f"   Due: {task.due_date}")
+            lines.append("")
+        print_lines(lines)
 
         # Offer to complete a task
         choice = input("Mark task as complete? (Enter task number or 0 to skip): ").strip()
-        if choice.isdigit() and 0 < int(choice) <= len(pending):
-            task = pending[int(choice) - 1]
+        task = select(pending, choice)
+        if task is not None:
             if self.current_nurse.manage_tasks(task.task_id, "complete"):
-                print(Fore.GREEN + f"✓ Task '{task.title}' marked as complete")
+                print(f"{_OK}Task '{task.title}' marked as complete")
             else:
-                print(Fore.RED + "✗ Failed to update task")
+                print(f"{_FAIL}Failed to update task")
 
     def view_schedule(self):
         """View nurse's work schedule."""
@@ -390,14 +413,16 @@ class NurseCLI:
             print(Fore.YELLOW + "No scheduled activities.")
             return
 
+        lines = []
         for i, schedule in enumerate(schedules, 1):
-            print(f"{i}. {Fore.WHITE}Task: {schedule.task}")
-            print(f"   Date: {schedule.date}")
-            print(f"   Purpose: {schedule.purpose}")
-            print(f"   Priority: {schedule.priority}")
+            lines.append(f"{i}. {Fore.WHITE}Task: {schedule.task}")
+            lines.append(f"   Date: {schedule.date}")
+            lines.append(f"   Purpose: {schedule.purpose}")
+            lines.append(f"   Priority: {schedule.priority}")
             if schedule.location:
-                print(f"   Location: {schedule.location}")
-            print()
+                lines.append(f"   Location: {schedule.location}")
+            lines.append("")
+        print_lines(lines)
 
     def view_alerts(self):
         """View all alerts."""
@@ -411,28 +436,25 @@ class NurseCLI:
             print(Fore.YELLOW + "No active alerts.")
             return
 
+        lines = []
         for i, alert in enumerate(alerts, 1):
-            severity_color = {
-                "high": Fore.RED,
-                "medium": Fore.YELLOW,
-                "low": Fore.WHITE,
-            }.get(alert.severity, Fore.WHITE)
-
-            print(f"{i}. {severity_color}[{alert.severity.upper()}] {alert.message}")
-            print(f"   Type: {alert.type} | Priority: {alert.calculate_priority()}")
-            print(f"   Acknowledged: {'Yes' if alert.acknowledged_at else 'No'}")
-            print(f"   Resolved: {'Yes' if alert.resolved_at else 'No'}")
-            print()
+            severity_color = SEVERITY_COLORS.get(alert.severity, Fore.WHITE)
+            lines.append(f"{i}. {severity_color}[{alert.severity.upper()}] {alert.message}")
+            lines.append(f"   Type: {alert.type} | Priority: {alert.calculate_priority()}")
+            lines.append(f"   Acknowledged: {'Yes' if alert.acknowledged_at else 'No'}")
+            lines.append(f"   Resolved: {'Yes' if alert.resolved_at else 'No'}")
+            lines.append("")
+        print_lines(lines)
 
         # Offer to handle alerts
         choice = input("\nHandle an alert? (Enter alert number or 0 to skip): ").strip()
-        if choice.isdigit() and 0 < int(choice) <= len(alerts):
-            alert = alerts[int(choice) - 1]
+        alert = select(alerts, choice)
+        if alert is not None:
             action = input("Action (acknowledge/resolve): ").strip().lower()
             if self.current_nurse.handle_alert(alert.alert_id, action):
-                print(Fore.GREEN + f"✓ Alert {action}d successfully")
+                print(f"{_OK}Alert {action}d successfully")
             else:
-                print(Fore.RED + "✗ Failed to handle alert")
+                print(f"{_FAIL}Failed to handle alert")
 
     def generate_report(self):
         """Generate a report for the nurse's activities."""
@@ -444,11 +466,14 @@ class NurseCLI:
         start_date_str = input("Start date (YYYY-MM-DD): ").strip()
         end_date_str = input("End date (YYYY-MM-DD): ").strip()
 
+        if not (DATE_RE.fullmatch(start_date_str) and DATE_RE.fullmatch(end_date_str)):
+            print(f"{_FAIL}Invalid date format. Use YYYY-MM-DD.")
+            return
         try:
             start_date = datetime.fromisoformat(start_date_str)
             end_date = datetime.fromisoformat(end_date_str)
-        except ValueError:
-            print(Fore.RED + "✗ Invalid date format. Use YYYY-MM-DD.")
+        except ValueError:  # right shape, impossible date such as 2025-02-30
+            print(f"{_FAIL}Invalid date format. Use YYYY-MM-DD.")
             return
 
         report = self.current_nurse.generate_reports(start_date, end_date)
@@ -469,7 +494,7 @@ class NurseCLI:
         """Logout current nurse."""
         if self.current_nurse:
             self.current_nurse.logout()
-            print(Fore.GREEN + f"✓ Goodbye, Nurse {self.current_nurse.name}!")
+            print(f"{_OK}Goodbye, Nurse {self.current_nurse.name}!")
             self.current_nurse = None
         else:
             print(Fore.YELLOW + "No active session.")
@@ -477,53 +502,34 @@ class NurseCLI:
     def check_login(self):
         """Check if nurse is logged in."""
         if not self.current_nurse:
-            print(Fore.RED + "✗ Please login first.")
+            print(f"{_FAIL}Please login first.")
             return False
         return True
 
+    def _exit(self):
+        """Leave the main loop."""
+        self.running = False
+        print(Fore.CYAN + "\nThank you for using CareLog Nurse System!")
+
     def run(self):
         """Main application loop."""
         self.display_banner()
 
         while self.running:
             self.display_menu()
-            choice = input(Fore.WHITE + "\nEnter your choice: ").strip()
+            choice = input(CHOICE_PROMPT).strip()
 
             try:
-                if choice == "0":
-                    self.running = False
-                    print(Fore.CYAN + "\nThank you for using CareLog Nurse System!")
-                elif choice == "1":
-                    self.login()
-                elif choice == "2":
-                    self.view_patients()
-                elif choice == "3":
-                    self.view_update_vitals()
-                elif choice == "4":
-                    self.administer_medication()
-                elif choice == "5":
-                    self.manage_food_deliveries()
-                elif choice == "6":
-                    self.create_food_delivery()
-                elif choice == "7":
-                    self.coordinate_care()
-                elif choice == "8":
-                    self.view_pending_tasks()
-                elif choice == "9":
-                    self.view_schedule()
-                elif choice == "10":
-                    self.view_alerts()
-                elif choice == "11":
-                    self.generate_report()
-                elif choice == "12":
-                    self.logout()
+                handler = self._menu.get(choice)
+                if handler is not None:
+                    handler()
                 else:
-                    print(Fore.RED + "✗ Invalid choice. Please try again.")
+                    print(f"{_FAIL}Invalid choice. Please try again.")
             except KeyboardInterrupt:
                 print(Fore.YELLOW + "\n\nOperation cancelled by user.")
             except Exception as e:
-                print(Fore.RED + f"✗ Error: {str(e)}")
-            input(Fore.WHITE + "\nPress Enter to continue...")
+                print(f"{_FAIL}Error: {str(e)}")
+            input(CONTINUE_PROMPT)
 
         print(Fore.CYAN + "Exiting...\n")
 
@@ -1,25 +1,61 @@
+import hashlib
+import re
+from collections import OrderedDict
+
 from app.carelog_service import CareLogService
 from app.model.patient import Patient
 from app.model.wellbeing_log import WellbeingLog
 
+# Menus are built once and printed with a single write.
+_MAIN_MENU = "\nCareLog MVP\n1. Register\n2. Login\n3. Exit"
+_PATIENT_MENU = (
+    "1. Add Wellbeing Log\n"
+    "2. View History\n"
+    "3. Update Profile\n"
+    "4. Search Care Staff\n"
+    "5. Logout"
+)
+
+# Rejects malformed addresses before update_patient re-encrypts and saves them
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+_MAIN_OPTS = frozenset({"1", "2", "3"})
+_PATIENT_OPTS = frozenset({"1", "2", "3", "4", "5"})
+
+_UNREADABLE = "(unable to decrypt)"
+
+# Digests of (key, ciphertext) pairs that already failed to decrypt, so a
+# corrupt log is not put through AES-GCM and an exception on every view.
+# Bounded, least recently seen first, and cleared on login and logout.
+_FAILED_DECRYPT_LIMIT = 256
+_failed_decrypts: "OrderedDict[bytes, None]" = OrderedDict()
+
+
+def _safe_decrypt(log: WellbeingLog, field: str, getter):
+    """Return getter()'s plaintext, or _UNREADABLE if this ciphertext has failed before."""
+    token = log.payload if log.payload is not None else getattr(log, field)
+    digest = hashlib.blake2b(log.key + str(token).encode(), digest_size=8).digest()
+    if digest in _failed_decrypts:
+        _failed_decrypts.move_to_end(digest)
+        return _UNREADABLE
+    try:
+        return getter()
+    except Exception:
+        _failed_decrypts[digest] = None
+        if len(_failed_decrypts) > _FAILED_DECRYPT_LIMIT:
+            _failed_decrypts.popitem(last=False)
+        return _UNREADABLE
+
 
 class PatientCli:
     def show_main_menu(self):
-        print("\nCareLog MVP")
-        print("1. Register")
-        print("2. Login")
-        print("3. Exit")
+        print(_MAIN_MENU)
         return input("Choose an option: ")
 
     def show_patient_menu(self, patient: Patient):
         # Always display the decrypted name
         decrypted_name = patient.get_decrypted_name()
-        print(f"\nWelcome {decrypted_name}!")
-        print("1. Add Wellbeing Log")
-        print("2. View History")
-        print("3. Update Profile")
-        print("4. Search Care Staff")
-        print("5. Logout")
+        print(f"\nWelcome {decrypted_name}!\n{_PATIENT_MENU}")
         return input("Choose an option: ")
 
     def get_registration_details(self):
@@ -46,27 +82,15 @@ class PatientCli:
         Display decrypted wellbeing log information.
         Handles decryption errors gracefully.
         """
-        try:
-            decrypted_pain_level = log.get_decrypted_pain_level()
-        except Exception:
-            decrypted_pain_level = "(unable to decrypt)"
-        try:
-            decrypted_mood = log.get_decrypted_mood()
-        except Exception:
-            decrypted_mood = "(unable to decrypt)"
-        try:
-            decrypted_appetite = log.get_decrypted_appetite()
-        except Exception:
-            decrypted_appetite = "(unable to decrypt)"
-        try:
-            decrypted_notes = log.get_decrypted_notes()
-        except Exception:
-            decrypted_notes = "(unable to decrypt)"
-        print(f"\nLog Date: {log.timestamp}")
-        print(f"Pain Level: {decrypted_pain_level}")
-        print(f"Mood: {decrypted_mood}")
-        print(f"Appetite: {decrypted_appetite}")
-        print(f"Notes: {decrypted_notes}")
+        decrypted_pain_level = _safe_decrypt(log, "pain_level", log.get_decrypted_pain_level)
+        decrypted_mood = _safe_decrypt(log, "mood", log.get_decrypted_mood)
+        decrypted_appetite = _safe_decrypt(log, "appetite", log.get_decrypted_appetite)
+        decrypted_notes = _safe_decrypt(log, "notes", log.get_decrypted_notes)
+        print(f"\nLog Date: {log.timestamp}\n"
+              f"Pain Level: {decrypted_pain_level}\n"
+              f"Mood: {decrypted_mood}\n"
+              f"Appetite: {decrypted_appetite}\n"
+              f"Notes: {decrypted_notes}")
 
     def get_profile_update_details(self):
         print("Leave blank if you don't want to update")
@@ -78,9 +102,9 @@ class PatientCli:
         return input("Enter search term (name or field): ")
 
     def show_staff_details(self, staff):
-        print(f"\nName: {staff['name']}")
-        print(f"Field: {staff['field']}")
-        print(f"Contact: {staff['contact']}")
+        print(f"\nName: {staff['name']}\n"
+              f"Field: {staff['field']}\n"
+              f"Contact: {staff['contact']}")
     
     def run(self):
         # Initialize services and state
@@ -92,7 +116,7 @@ class PatientCli:
             choice = self.show_main_menu()
             
             # Validate main menu choice
-            if not validate_choice(choice, ['1', '2', '3']):
+            if not validate_choice(choice, _MAIN_OPTS):
                 print("Invalid option! Please choose 1, 2, or 3")
                 continue
 
@@ -117,13 +141,14 @@ class PatientCli:
                     current_patient = service.login(email, password)
                     
                     if current_patient:
+                        _failed_decrypts.clear()
                         # Patient menu loop
                         while True:
                             # Pass the Patient object, not just the name
                             subchoice = self.show_patient_menu(current_patient)
                             
                             # Validate patient menu choice
-                            if not validate_choice(subchoice, ['1', '2', '3', '4', '5']):
+                            if not validate_choice(subchoice, _PATIENT_OPTS):
                                 print("Invalid option! Please choose 1-5")
                                 continue
 
@@ -151,8 +176,6 @@ class PatientCli:
                                 if not logs:
                                     print("No history found.")
                                 else:
-                                    # Ensure logs are reconstructed for decryption
-                                    from app.model.wellbeing_log import WellbeingLog
                                     for log in logs:
                                         # logs are already WellbeingLog objects if get_patient_history is correct
                                         self.show_wellbeing_log(log)
@@ -161,7 +184,7 @@ class PatientCli:
                                 # Update Profile
                                 try:
                                     new_email, new_phone = self.get_profile_update_details()
-                                    if new_email and '@' not in new_email:
+                                    if new_email and not _EMAIL_RE.fullmatch(new_email):
                                         print("Invalid email format!")
                                         continue
                                     
@@ -172,8 +195,9 @@ class PatientCli:
                                             email=new_email
                                         )
                                         if updated_patient:
-                                            # Reconstruct Patient object to ensure decrypted display
-                                            current_patient = Patient.patient_from_dict(updated_patient.to_dict())
+                                            # update_patient returns a fresh Patient; its memo is
+                                            # keyed by ciphertext, so the new values display as is
+                                            current_patient = updated_patient
                                             print("Profile updated successfully!")
                                         else:
                                             print("Update failed!")
@@ -196,6 +220,7 @@ class PatientCli:
                             elif subchoice == "5":
                                 # Logout
                                 current_patient = None
+                                _failed_decrypts.clear()
                                 print("Logged out successfully!")
                                 break
                             
@@ -210,6 +235,6 @@ class PatientCli:
                 print("Thank you for using CareLog!")
                 break
 
-def validate_choice(choice: str, valid_options: list) -> bool:
+def validate_choice(choice: str, valid_options: frozenset) -> bool:
     """Validate if user input is one of the valid options"""
     return choice in valid_options
\ No newline at end of file
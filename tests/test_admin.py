@@ -108,3 +108,103 @@ def test_search_patients_by_keyword(capsys):
 	out = capsys.readouterr().out
 	assert "patient(s) found" in out or "p5" in out
 
+
+
+def test_search_patients_by_keyword_reuses_decrypted_text(capsys, monkeypatch):
+	admin = Admin()
+	p = Patient(id="p6", name="Jane Doe", email="jane@example.com", phone="123123", password="pw12345")
+	admin.add_new_patients([p])
+
+	admin.search_patients_by_keyword("jane")
+	calls = []
+	original = Patient.decrypt_field
+
+	def counting_decrypt(self, token, aead=None):
+		calls.append(token)
+		return original(self, token, aead)
+
+	monkeypatch.setattr(Patient, "decrypt_field", counting_decrypt)
+	admin.search_patients_by_keyword("DOE")
+	assert calls == []
+	assert "1 patient(s) found" in capsys.readouterr().out
+
+	# an update must be visible to the next search
+	admin.update_patients_information("p6", 1, "Jane Roe")
+	capsys.readouterr()
+	admin.search_patients_by_keyword("roe")
+	assert "1 patient(s) found" in capsys.readouterr().out
+
+
+def test_register_uses_fresh_salt_and_configured_rounds(monkeypatch):
+	monkeypatch.setenv("CARELOG_BCRYPT_ROUNDS", "4")
+	a1 = Admin.register("A One", "adm1", "a1@example.com", "samepass")
+	a2 = Admin.register("A Two", "adm2", "a2@example.com", "samepass")
+	assert a1.password.startswith("$2b$04$")
+	assert a1.password[:29] != a2.password[:29]
+	assert a1.login({"email": "a1@example.com", "password": "samepass"})
+
+
+def test_search_patients_by_keyword_scans_joined_haystack(capsys):
+	admin = Admin()
+	admin.add_new_patients([
+		Patient(id="h1", name="Ann Lee", email="ann@a.org", phone="111", password="pw12345"),
+		Patient(id="h2", name="Bo Lee", email="bo@b.org", phone="222", password="pw12345"),
+		Patient(id="h3", name="Cy Moss", email="cy@c.org", phone="333", password="pw12345"),
+	])
+	capsys.readouterr()
+
+	admin.search_patients_by_keyword("LEE")
+	out = capsys.readouterr().out
+	assert "2 patient(s) found" in out and "id: h1" in out and "id: h2" in out
+
+	# fields and rows are separated, so a match cannot straddle them
+	admin.search_patients_by_keyword("moss" + "cy")
+	assert "No patient found" in capsys.readouterr().out
+
+	admin.search_patients_by_keyword("")
+	assert "3 patient(s) found" in capsys.readouterr().out
+
+
+def test_search_patient_information_caches_decryption(capsys, monkeypatch):
+	admin = Admin()
+	p = Patient(id="p7", name="Ivy Lane", email="ivy@example.com", phone="555000", password="pw12345")
+	DataStore.append_to_collection("patients", p.to_dict())
+	admin.search_patient_information("p7")
+
+	calls = []
+	original = Patient.decrypt_field
+
+	def counting_decrypt(self, token, aead=None):
+		calls.append(token)
+		return original(self, token, aead)
+
+	monkeypatch.setattr(Patient, "decrypt_field", counting_decrypt)
+	admin.search_patient_information("p7")
+	assert calls == []
+	assert "Ivy Lane" in capsys.readouterr().out
+
+	admin.update_patients_information("p7", 1, "Ivy Hill")
+	capsys.readouterr()
+	admin.search_patient_information("p7")
+	assert "Ivy Hill" in capsys.readouterr().out
+
+
+def test_search_carestaffs_by_keyword_casefolds(capsys):
+	admin = Admin()
+	admin.add_new_carestaffs([
+		{"id": "cs3", "name": "Grete Straße", "department": "Ward", "specialization": "Geriatrics"},
+		{"id": "cs4", "name": "Ola", "department": "ICU", "specialization": "Critical"},
+	])
+	capsys.readouterr()
+
+	admin.search_carestaffs_by_keyword("STRASSE")
+	out = capsys.readouterr().out
+	assert "1 carestaff(s) found" in out and "id: cs3" in out
+
+	admin.search_carestaffs_by_keyword("icu")
+	out = capsys.readouterr().out
+	assert "1 carestaff(s) found" in out and "id: cs4" in out
+
+
+def test_admin_instances_are_slotted():
+	assert not hasattr(Admin(id="a1", phone="123"), "__dict__")
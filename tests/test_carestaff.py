@@ -43,6 +43,15 @@ class TestCareStaff:
         assert len(staff.assigned_patients) == 0
         assert len(staff.tasks) == 0
 
+    def test_instances_are_slotted(self):
+        staff = [
+            CareStaff("Jane Doe", "cs001"),
+            Doctor("Dr. Smith", "doc001", license_number="LIC123"),
+            Nurse("Nurse Joy", "nur001", license_number="LIC789"),
+        ]
+        for member in staff:
+            assert not hasattr(member, "__dict__")
+
     def test_view_schedules(self):
         staff = CareStaff("John", "cs002")
         schedule1 = Schedule("cs002", "Morning Rounds", "2025-01-01")
@@ -1,9 +1,20 @@
+from dataclasses import asdict, fields, replace
 from datetime import datetime
 
+import pytest
+
 from app.model.alerts import Alert, NotificationService
 from app.model.carestaff import CareStaff, Doctor, Nurse
+from app.data.datastore import DataStore
+from app.model.medical import HISTORY_KEEP, HISTORY_LIMIT, MedicalDetails, VitalSigns
 from app.model.schedule import Task
 from app.model.user import User
+from app.model.vitals_table import (
+    ABNORMAL_HEART_RATE,
+    HIGH_TEMPERATURE,
+    LOW_OXYGEN_SATURATION,
+    VitalSignsTable,
+)
 
 
 def test_user_login_logout_flow():
@@ -14,6 +25,13 @@ def test_user_login_logout_flow():
     assert user.is_logged_in is False
 
 
+def test_user_login_plain_password_compare():
+    user = User(user_id="u1", name="Test User", email="user@example.com", password="sécret", role="patient")
+    assert user.login({"email": "user@example.com", "password": "sécret"}) is True
+    assert user.login({"email": "user@example.com", "password": "secret"}) is False
+    assert user.login({"email": "user@example.com"}) is False
+
+
 def test_carestaff_and_task_management(monkeypatch):
     staff = CareStaff("Nora", "c1", department="General", specialization="Care")
     task = Task(
@@ -65,3 +83,105 @@ def test_alerts_and_notifications():
     notifier = NotificationService(service_id="svc1", channels=["email"])
     assert notifier.send_immediate_alert(user, "Test message") is True
     assert notifier.batch_notify([user], "Reminder") is True
+
+
+def test_vital_signs_table_anomalies():
+    pytest.importorskip("numpy")
+
+    def reading(record_id, **vitals):
+        return VitalSigns(
+            record_id=record_id,
+            created_at=datetime(2025, 1, 1),
+            updated_at=datetime(2025, 1, 1),
+            created_by="n1",
+            measured_at=datetime(2025, 1, 1, 9, 30),
+            **vitals,
+        )
+
+    records = [
+        reading("v1", temperature=36.8, heart_rate=72, oxygen_saturation=98.0),
+        reading("v2", temperature=38.6, heart_rate=130, oxygen_saturation=90.0),
+    ]
+    table = VitalSignsTable.from_records(records)
+    flags = table.detect_anomalies()
+    assert flags[0] == 0
+    assert flags[1] == HIGH_TEMPERATURE | LOW_OXYGEN_SATURATION | ABNORMAL_HEART_RATE
+    assert [bin(int(f)).count("1") for f in flags] == [len(r.detect_anomalies()) for r in records]
+    assert table.index == ["v1", "v2"]
+
+
+def test_medical_record_validate_data():
+    now = datetime(2025, 1, 1)
+    assert VitalSigns(record_id="v1", created_at=now, updated_at=now, created_by="n1").validate_data() is True
+    assert VitalSigns(record_id="", created_at=now, updated_at=now, created_by="n1").validate_data() is False
+    assert VitalSigns(record_id="v2", created_at=now, updated_at=now, created_by="").validate_data() is False
+
+
+def test_medical_record_log_change_updates_timestamp():
+    created = datetime(2025, 1, 1)
+    vs = VitalSigns(record_id="v1", created_at=created, updated_at=created, created_by="n1")
+    assert vs.updated_at == created
+    before = datetime.now()
+    vs.log_change({"note": "checked"})
+    assert before <= vs.updated_at <= datetime.now()
+    assert vs.to_dict()["updatedAt"] == vs.updated_at.isoformat()
+
+
+def test_medical_record_updated_at_is_a_dataclass_field():
+    created = datetime(2025, 1, 1)
+    vs = VitalSigns(record_id="v1", created_at=created, updated_at=created, created_by="n1")
+    assert "updated_at" in {f.name for f in fields(vs)}
+    assert asdict(vs)["updated_at"] == created
+    assert "updated_at=" in repr(vs)
+    assert replace(vs).updated_at == created
+    assert replace(vs, updated_at=datetime(2025, 2, 1)) != vs
+
+
+def test_medical_record_history_overflow_is_archived(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataStore, "DATA_FILE", tmp_path / "carelog_test.json")
+    monkeypatch.setattr(DataStore, "_cache", None)
+    now = datetime(2025, 1, 1)
+    md = MedicalDetails(record_id="m1", created_at=now, updated_at=now, created_by="d1")
+    for i in range(HISTORY_LIMIT + 5):
+        md.update_description(str(i))
+    history = md.get_history()
+    assert len(history) == HISTORY_KEEP + 4
+    assert history[-1] == {"description": str(HISTORY_LIMIT + 4)}
+    expected = [{"description": str(i)} for i in range(HISTORY_LIMIT + 5)]
+    assert md.get_full_history() == expected
+    assert md.track_progress()["treatments_completed"] == str(HISTORY_LIMIT + 5)
+    restored = MedicalDetails.from_dict(DataStore.get_by_id("medical_details", "recordID", "m1"))
+    assert restored.get_history() == history
+    assert restored.get_full_history() == expected
+
+
+def test_medical_record_stale_copy_does_not_duplicate_archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataStore, "DATA_FILE", tmp_path / "carelog_test.json")
+    monkeypatch.setattr(DataStore, "_cache", None)
+    now = datetime(2025, 1, 1)
+    md = MedicalDetails(record_id="m1", created_at=now, updated_at=now, created_by="d1")
+    for i in range(HISTORY_LIMIT):
+        md.log_change({"description": str(i)})
+    stale = MedicalDetails.from_dict(md.to_dict())
+    md.update_description("a")
+    stale.update_description("a")
+    assert len(DataStore.get_collection("medical_history_archive")) == 2
+    expected = [{"description": str(i)} for i in range(HISTORY_LIMIT)] + [{"description": "a"}]
+    assert stale.get_full_history() == expected
+
+
+def test_medical_record_loaded_history_is_not_truncated():
+    now = datetime(2025, 1, 1)
+    vs = VitalSigns(record_id="v1", created_at=now, updated_at=now, created_by="n1")
+    data = vs.to_dict()
+    data["history"] = [{"n": str(i)} for i in range(HISTORY_LIMIT + 50)]
+    assert len(VitalSigns.from_dict(data).get_history()) == HISTORY_LIMIT + 50
+
+
+def test_medical_record_validate_data_follows_reassignment():
+    now = datetime(2025, 1, 1)
+    vs = VitalSigns(record_id="v1", created_at=now, updated_at=now, created_by="n1")
+    vs.created_by = ""
+    assert vs.validate_data() is False
+    vs.created_by = "n2"
+    assert vs.validate_data() is True
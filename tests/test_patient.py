@@ -5,7 +5,11 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 import pytest
 from datetime import datetime
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
+import app.model.patient as patient_module
 from app.model.patient import Patient
 from app.model.wellbeing_log import WellbeingLog
 from app.carelog_service import CareLogService
@@ -112,6 +116,52 @@ def test_encryption_decryption(patient_data):
     assert patient.get_decrypted_phone() == patient_data["phone"]
 
 
+def test_decrypted_fields_are_memoized(patient_data, monkeypatch):
+    patient = Patient.patient_from_dict(Patient(**patient_data).to_dict())
+    calls = []
+    original = Patient.decrypt_field
+
+    def counting_decrypt(self, token, aead=None):
+        calls.append(token)
+        return original(self, token, aead)
+
+    monkeypatch.setattr(Patient, "decrypt_field", counting_decrypt)
+    assert patient.decrypted_name == patient_data["name"]
+    assert patient.get_decrypted_name() == patient_data["name"]
+    assert patient.decrypted_email == patient_data["email"]
+    # the first miss decrypts all three fields; later reads are free
+    assert len(calls) == 3
+
+    # freshly registered patients never decrypt their own fields
+    calls.clear()
+    assert Patient(**patient_data).decrypted_phone == patient_data["phone"]
+    assert calls == []
+
+    # a new ciphertext must not be served from the memo
+    patient.phone = patient.encrypt_field("0999999999")
+    assert patient.decrypted_phone == "0999999999"
+
+
+def test_gcm_tokens_and_legacy_cbc_tokens(patient_data):
+    patient = Patient(**patient_data)
+    assert patient.name.startswith("g64:")
+    assert "iv" not in patient.to_dict()
+
+    # Hex-encoded GCM tokens from before the switch to base64 still decrypt.
+    nonce = os.urandom(12)
+    hex_token = "gcm:" + (nonce + AESGCM(patient.key).encrypt(nonce, b"Hex Name", None)).hex()
+    assert patient.decrypt_field(hex_token) == "Hex Name"
+
+    # Records written before the switch to AES-GCM hold hex(iv || AES-CBC).
+    iv = os.urandom(16)
+    padder = padding.PKCS7(128).padder()
+    padded = padder.update(b"Legacy Name") + padder.finalize()
+    encryptor = Cipher(algorithms.AES(patient.key), modes.CBC(iv)).encryptor()
+    legacy = (iv + encryptor.update(padded) + encryptor.finalize()).hex()
+    record = dict(patient.to_dict(), name=legacy, iv=iv.hex())
+    assert Patient.patient_from_dict(record).get_decrypted_name() == "Legacy Name"
+
+
 @pytest.mark.parametrize("field,value", [("id", ""), ("name", ""), ("email", ""), ("phone", ""), ("password", "")])
 def test_missing_required_fields(field, value, patient_data):
     data = patient_data.copy()
@@ -137,6 +187,29 @@ def test_patient_from_dict(patient_data):
     assert loaded.verify_password(patient_data["password"])
 
 
+def test_patient_hash_agrees_with_eq(patient_data):
+    patient = Patient(**patient_data)
+    loaded = Patient.patient_from_dict(patient.to_dict())
+    assert loaded == patient
+    assert {patient, loaded} == {patient}
+    assert hash(loaded) == hash(patient)
+
+
+def test_master_key_derives_patient_keys(patient_data, monkeypatch):
+    monkeypatch.setattr(patient_module, "_MASTER_KEY", bytes(range(32)))
+    patient = Patient(**patient_data)
+    assert patient.key == Patient(**patient_data).key
+
+    record = patient.to_dict()
+    del record["key"]
+    assert Patient.patient_from_dict(record).get_decrypted_name() == patient_data["name"]
+
+    monkeypatch.setattr(patient_module, "_MASTER_KEY", None)
+    assert Patient(**patient_data).key != patient.key
+    with pytest.raises(ValueError):
+        Patient.patient_from_dict(record)
+
+
 @pytest.fixture
 def log_data():
     return {
@@ -168,6 +241,41 @@ def test_log_serialization_deserialization(log_data):
     assert loaded.get_decrypted_notes() == log_data["notes"]
 
 
+def test_log_decryption_is_memoized(log_data, monkeypatch):
+    loaded = WellbeingLog.from_dict(WellbeingLog(**log_data).to_dict())
+    calls = []
+    original = WellbeingLog.decrypt_bytes
+
+    def counting_decrypt(self, token):
+        calls.append(token)
+        return original(self, token)
+
+    monkeypatch.setattr(WellbeingLog, "decrypt_bytes", counting_decrypt)
+    repr(loaded)
+    repr(loaded)
+    # all four fields live in one packed payload
+    assert len(calls) == 1
+
+
+def test_log_packed_payload_and_legacy_fields(log_data):
+    log = WellbeingLog(**log_data)
+    stored = log.to_dict()
+    assert "payload" in stored
+    assert "mood" not in stored and "pain_level" not in stored
+
+    # Logs written before the packed layout hold one token per field.
+    legacy = {k: v for k, v in stored.items() if k != "payload"}
+    legacy.update(pain_level=log.encrypt_field("7"), mood=log.encrypt_field("Calm"),
+                  appetite=log.encrypt_field("Fair"), notes=log.encrypt_field("Slept well"))
+    loaded = WellbeingLog.from_dict(legacy)
+    assert loaded.get_decrypted_pain_level() == 7
+    assert loaded.get_decrypted_notes() == "Slept well"
+    assert loaded.to_dict() == legacy
+
+    with pytest.raises(ValueError):
+        WellbeingLog(**dict(log_data, pain_level=300))
+
+
 @pytest.mark.parametrize("field,value", [("id", ""), ("patient_id", ""), ("timestamp", ""), ("pain_level", ""), ("mood", ""), ("appetite", ""), ("notes", "")])
 def test_missing_required_fields_log(field, value, log_data):
     data = log_data.copy()
@@ -212,3 +320,12 @@ def test_update_profile(service):
     assert updated.get_decrypted_email() == "eve2@example.com"
     assert updated.get_decrypted_phone() == "0987654321"
     assert service.update_patient(patient_id="invalid_id", email="x@example.com") is None
+
+
+def test_update_profile_unchanged_skips_write(service, monkeypatch):
+    patient = service.register_patient("Fay", "fay@example.com", "0111222333", "faypass")
+    writes = []
+    monkeypatch.setattr(DataStore, "upsert", classmethod(lambda cls, *args: writes.append(args)))
+    updated = service.update_patient(patient_id=patient.id, email="fay@example.com", phone="0111222333")
+    assert updated.get_decrypted_email() == "fay@example.com"
+    assert writes == []
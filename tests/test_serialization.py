@@ -1,6 +1,9 @@
 from datetime import datetime
 from pathlib import Path
 
+import pytest
+
+from app.data import datastore as datastore_module
 from app.data.datastore import DataStore
 from app.model.alerts import Alert, NotificationService
 from app.model.assignment import PatientAssignment
@@ -18,6 +21,13 @@ def test_user_serialization_roundtrip():
     assert u2.user_id == u.user_id
     assert u2.email == u.email
     assert u2.role == u.role
+    assert isinstance(d["createdAt"], int)
+    assert u2.created_at == u.created_at.replace(microsecond=0)
+
+
+def test_user_from_dict_accepts_legacy_iso_created_at():
+    u = User.from_dict({"id": "u1", "createdAt": "2025-01-02T03:04:05"})
+    assert u.created_at == datetime(2025, 1, 2, 3, 4, 5)
 
 
 def test_medical_details_log_vitals_serialization_roundtrip():
@@ -101,6 +111,8 @@ def test_food_assignment_schedule_task_appointment_roundtrip():
     s2 = Schedule.from_dict(sd)
     assert s2.schedule_id == "sid1"
     assert s2.purpose == "Purpose"
+    # generated ids must be stable across processes (no salted hash())
+    assert Schedule("c1", "TaskName", "2025-01-01").schedule_id == "sch-c1-c89cefb9"
 
     ap = Appointment(appointment_id="ap1", patient_id="p1", date_and_time=datetime.now(), type="consultation")
     apd = ap.to_dict()
@@ -162,3 +174,176 @@ def test_datastore_crud_roundtrip(tmp_path):
     # Delete
     assert DataStore.delete_by_id("patients", "id", "PX1") is True
     assert DataStore.get_by_id("patients", "id", "PX1") is None
+
+
+def test_medical_record_datetime_objects_persist(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataStore, "DATA_FILE", tmp_path / "carelog_dt.json")
+    monkeypatch.setattr(VitalSigns, "SERIALIZE_DATETIME_AS_OBJECT", True)
+    created = datetime(2025, 1, 2, 3, 4, 5)
+    vs = VitalSigns(record_id="v2", created_at=created, updated_at=created, created_by="nurse1", measured_at=created)
+    vsd = vs.to_dict()
+    assert vsd["createdAt"] is created
+
+    DataStore.upsert("vital_signs", "recordID", vsd)
+    stored = DataStore.get_by_id("vital_signs", "recordID", "v2")
+    assert stored["createdAt"] == created.isoformat()
+    assert VitalSigns.from_dict(stored).measured_at == created
+
+
+def test_datastore_batch_defers_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataStore, "DATA_FILE", tmp_path / "carelog_batch.json")
+    DataStore.ensure_data_file()
+    writes = []
+    original_write = DataStore._write.__func__
+
+    def counting_write(cls, data):
+        writes.append(data)
+        original_write(cls, data)
+
+    monkeypatch.setattr(DataStore, "_write", classmethod(counting_write))
+
+    with DataStore.batch():
+        DataStore.append_to_collection("patients", {"id": "B1"})
+        with DataStore.batch():
+            DataStore.upsert("carestaffs", "id", {"id": "C1", "name": "Cara"})
+        DataStore.delete_by_id("patients", "id", "B1")
+        DataStore.append_to_collection("patients", {"id": "B2"})
+        assert DataStore.get_by_id("patients", "id", "B2") == {"id": "B2"}
+        assert writes == []
+
+    assert len(writes) == 1
+    assert DataStore.get_by_id("patients", "id", "B1") is None
+    assert DataStore.get_by_id("patients", "id", "B2") == {"id": "B2"}
+    assert DataStore.get_by_id("carestaffs", "id", "C1")["name"] == "Cara"
+
+
+def test_datastore_get_by_id_index_tracks_file_changes(tmp_path, monkeypatch):
+    data_file = tmp_path / "carelog_index.json"
+    monkeypatch.setattr(DataStore, "DATA_FILE", data_file)
+    DataStore.ensure_data_file()
+    DataStore.set_collection("patients", [{"id": "P1", "n": 1}, {"id": "P1", "n": 2}])
+
+    assert DataStore.get_by_id("patients", "id", "P1")["n"] == 1
+    assert DataStore.get_by_id("patients", "id", "missing") is None
+
+    DataStore.upsert("patients", "id", {"id": "P2", "n": 3})
+    assert DataStore.get_by_id("patients", "id", "P2")["n"] == 3
+
+    # An out-of-band rewrite of the file must not be shadowed by the index.
+    data_file.write_text('{"patients": [{"id": "P9", "n": 9}]}', encoding="utf-8")
+    assert DataStore.get_by_id("patients", "id", "P1") is None
+    assert DataStore.get_by_id("patients", "id", "P9")["n"] == 9
+
+
+def test_datastore_load_all_cache_tracks_file_changes(tmp_path, monkeypatch):
+    data_file = tmp_path / "carelog_cache.json"
+    monkeypatch.setattr(DataStore, "DATA_FILE", data_file)
+    parses = []
+    original_loads = datastore_module._loads
+
+    def counting_loads(raw):
+        parses.append(raw)
+        return original_loads(raw)
+
+    monkeypatch.setattr(datastore_module, "_loads", counting_loads)
+
+    DataStore.ensure_data_file()
+    first = DataStore.load_all()
+    assert DataStore.load_all() == first
+    assert len(parses) == 1
+
+    DataStore.append_to_collection("patients", {"id": "P1"})
+    assert DataStore.get_collection("patients") == [{"id": "P1"}]
+    assert len(parses) == 2
+
+    data_file.write_text('{"patients": []}', encoding="utf-8")
+    assert DataStore.get_collection("patients") == []
+
+
+def test_datastore_reads_are_isolated_from_caller_mutation(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataStore, "DATA_FILE", tmp_path / "carelog_copies.json")
+    DataStore.ensure_data_file()
+    DataStore.append_to_collection("patients", {"id": "P1", "tags": ["a"]})
+
+    DataStore.load_all()["patients"].clear()
+    DataStore.get_collection("patients")[0]["id"] = "changed"
+    DataStore.get_by_id("patients", "id", "P1")["tags"].append("b")
+
+    assert DataStore.load_all()["patients"] == [{"id": "P1", "tags": ["a"]}]
+    assert DataStore.get_by_id("patients", "id", "P1") == {"id": "P1", "tags": ["a"]}
+
+
+def test_datastore_msgpack_sidecar_tracks_json(tmp_path, monkeypatch):
+    pytest.importorskip("msgpack")
+    data_file = tmp_path / "carelog_sidecar.json"
+    monkeypatch.setattr(DataStore, "DATA_FILE", data_file)
+    monkeypatch.setattr(DataStore, "_cache", None)
+    data_file.write_text('{"patients": [{"id": "P1"}]}', encoding="utf-8")
+
+    assert DataStore.get_collection("patients") == [{"id": "P1"}]
+    assert data_file.with_suffix(".msgpack").exists()
+
+    parses = []
+    monkeypatch.setattr(datastore_module, "_loads", lambda raw: parses.append(raw))
+    monkeypatch.setattr(DataStore, "_cache", None)
+    assert DataStore.get_collection("patients") == [{"id": "P1"}]
+    assert parses == []
+
+
+def test_datastore_sidecar_not_rebuilt_after_own_save(tmp_path, monkeypatch):
+    pytest.importorskip("msgpack")
+    monkeypatch.setattr(DataStore, "DATA_FILE", tmp_path / "carelog_own.json")
+    monkeypatch.setattr(DataStore, "_cache", None)
+    sidecar_writes = []
+    monkeypatch.setattr(DataStore, "_write_sidecar", classmethod(lambda cls, sig, data: sidecar_writes.append(sig)))
+
+    DataStore.ensure_data_file()
+    assert DataStore.get_collection("patients") == []
+    assert len(sidecar_writes) == 1
+
+    DataStore.append_to_collection("patients", {"id": "P1"})
+    assert DataStore.get_collection("patients") == [{"id": "P1"}]
+    assert len(sidecar_writes) == 1
+
+    # A process that did not write the file builds the sidecar on first load.
+    monkeypatch.setattr(DataStore, "_written_signature", None)
+    monkeypatch.setattr(DataStore, "_cache", None)
+    assert DataStore.get_collection("patients") == [{"id": "P1"}]
+    assert len(sidecar_writes) == 2
+
+
+def test_datastore_sidecar_failure_does_not_break_reads(tmp_path, monkeypatch):
+    pytest.importorskip("msgpack")
+    data_file = tmp_path / "carelog_big.json"
+    monkeypatch.setattr(DataStore, "DATA_FILE", data_file)
+    monkeypatch.setattr(DataStore, "_cache", None)
+    data_file.write_text('{"patients": []}', encoding="utf-8")
+    # Integers beyond 64 bits parse from JSON but make msgpack raise OverflowError.
+    monkeypatch.setattr(datastore_module, "_loads", lambda raw: {"patients": [{"n": 2**70}]})
+
+    assert DataStore.get_collection("patients") == [{"n": 2**70}]
+    assert not data_file.with_suffix(".msgpack").exists()
+
+
+
+def test_datastore_save_keeps_file_mode(tmp_path, monkeypatch):
+    data_file = tmp_path / "carelog_mode.json"
+    monkeypatch.setattr(DataStore, "DATA_FILE", data_file)
+    data_file.write_text('{"patients": []}', encoding="utf-8")
+    data_file.chmod(0o640)
+
+    DataStore.append_to_collection("patients", {"id": "P1"})
+    assert data_file.stat().st_mode & 0o777 == 0o640
+
+
+def test_datastore_sidecar_takes_data_file_mode(tmp_path, monkeypatch):
+    pytest.importorskip("msgpack")
+    data_file = tmp_path / "carelog_private.json"
+    monkeypatch.setattr(DataStore, "DATA_FILE", data_file)
+    monkeypatch.setattr(DataStore, "_cache", None)
+    monkeypatch.setattr(DataStore, "_written_signature", None)
+    data_file.write_text('{"patients": []}', encoding="utf-8")
+    data_file.chmod(0o600)
+
+    DataStore.load_all()
+    assert data_file.with_suffix(".msgpack").stat().st_mode & 0o777 == 0o600